@@ -8,8 +8,24 @@ __version__ = "0.1.0"
 __author__ = "Sports Betting Bot"
 
 from .features import FeatureBuilder, create_feature_builder
+from .bankroll import BankrollTracker, create_bankroll_tracker
+from .backfill import BackfillRunner, create_backfill_runner
+from .odds_dedup import collapse_odds_snapshots, compact_odds_snapshots
+from .replay import ReplaySimulator, create_replay_simulator, generate_synthetic_odds
+from .slate import SlateScheduler, create_slate_scheduler
 
 __all__ = [
     "FeatureBuilder",
     "create_feature_builder",
+    "BankrollTracker",
+    "create_bankroll_tracker",
+    "BackfillRunner",
+    "create_backfill_runner",
+    "collapse_odds_snapshots",
+    "compact_odds_snapshots",
+    "ReplaySimulator",
+    "create_replay_simulator",
+    "generate_synthetic_odds",
+    "SlateScheduler",
+    "create_slate_scheduler",
 ] 
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+NBA Feature Backfill Module
+
+Rebuilds features for the full game history by partitioning games into
+tipoff date-range shards and processing them in a process pool.
+"""
+
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .features import create_feature_builder
+except ImportError:
+    from features import create_feature_builder
+
+
+def _to_jsonable(value):
+    """Convert numpy / pandas scalars into JSON-safe Python values."""
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _load_shard_output(path: str) -> List[Dict]:
+    """Read the feature rows already written for a shard."""
+    if not os.path.exists(path):
+        return []
+
+    rows = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn final line from a crashed run; that game is rebuilt
+                break
+    return rows
+
+
+def _shard_fingerprint(game_ids: List[str]) -> str:
+    """Hash of a shard's game id set, stored with its done marker."""
+    return hashlib.sha256('\n'.join(sorted(game_ids)).encode()).hexdigest()
+
+
+def _shard_is_done(done_path: str, game_ids: List[str]) -> bool:
+    """A done marker only counts if it was written for the same game set."""
+    if not os.path.exists(done_path):
+        return False
+
+    try:
+        with open(done_path) as f:
+            marker = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+
+    return marker.get('game_ids_hash') == _shard_fingerprint(game_ids)
+
+
+# Builder owned by this worker process, created once by the pool initializer
+_worker_builder = None
+
+
+def _init_worker(builder_factory: Callable) -> None:
+    """Pool initializer giving each worker process its own Supabase / HTTP clients."""
+    global _worker_builder
+    _worker_builder = builder_factory()
+
+
+def _run_shard(shard: Dict, builder_factory: Callable, checkpoint_dir: str) -> Tuple[str, List[str]]:
+    """Build features for a shard, resuming from its checkpoint; returns (output path, failed ids)."""
+    output_path = os.path.join(checkpoint_dir, f"{shard['shard_id']}.jsonl")
+    done_path = os.path.join(checkpoint_dir, f"{shard['shard_id']}.done")
+    failed_path = os.path.join(checkpoint_dir, f"{shard['shard_id']}.failed.json")
+    game_ids = shard['game_ids']
+
+    if _shard_is_done(done_path, game_ids):
+        return output_path, []
+
+    # A stale marker from a different game set must not survive a crash
+    if os.path.exists(done_path):
+        os.remove(done_path)
+
+    # Keep only rows for games still in the shard
+    wanted = set(game_ids)
+    rows = [row for row in _load_shard_output(output_path) if row.get('game_id') in wanted]
+    completed = {row['game_id'] for row in rows}
+
+    # Rewrite valid rows so a torn line never precedes new output
+    with open(output_path, 'w') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+
+    # Reuse the worker's builder across shards; build one when run in-process
+    builder = _worker_builder if _worker_builder is not None else builder_factory()
+    failed = []
+
+    with open(output_path, 'a') as f:
+        for game_id in game_ids:
+            if game_id in completed:
+                continue
+            try:
+                features = builder.build_features_for_game(game_id)
+            except Exception as e:
+                print(f"Warning: Failed to process game {game_id}: {e}")
+                failed.append(game_id)
+                continue
+
+            row = {key: _to_jsonable(value) for key, value in features.items()}
+            f.write(json.dumps(row) + '\n')
+            f.flush()
+
+    # Only a fully built shard is marked done, so failed games retry next run
+    if failed:
+        with open(failed_path, 'w') as f:
+            json.dump(failed, f)
+        return output_path, failed
+
+    if os.path.exists(failed_path):
+        os.remove(failed_path)
+
+    with open(done_path, 'w') as f:
+        json.dump({
+            'game_ids_hash': _shard_fingerprint(game_ids),
+            'completed_at': datetime.now(timezone.utc).isoformat()
+        }, f)
+
+    return output_path, []
+
+
+class BackfillRunner:
+    """Runs full-history feature rebuilds across tipoff-date shards in parallel."""
+
+    def __init__(self, checkpoint_dir: str, builder_factory: Callable = create_feature_builder,
+                 max_workers: Optional[int] = None, shard_days: int = 7, run_id: Optional[str] = None):
+        """Configure checkpoint location, builder factory and pool size."""
+        if shard_days < 1:
+            raise ValueError("shard_days must be at least 1")
+
+        # A new run_id (e.g. feature schema version) starts a fresh rebuild
+        self.checkpoint_dir = os.path.join(checkpoint_dir, run_id) if run_id else checkpoint_dir
+        self.builder_factory = builder_factory
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shard_days = shard_days
+        self.failed_game_ids: List[str] = []
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    def fetch_game_index(self, supabase, start: Optional[str] = None, end: Optional[str] = None,
+                         page_size: int = 1000) -> pd.DataFrame:
+        """Fetch id and tipoff for every game in [start, end), ordered by tipoff."""
+        rows = []
+        offset = 0
+
+        try:
+            while True:
+                query = supabase.table('games').select('id, tipoff')
+                if start is not None:
+                    query = query.gte('tipoff', start)
+                if end is not None:
+                    query = query.lt('tipoff', end)
+                response = query.order('tipoff').range(offset, offset + page_size - 1).execute()
+
+                rows.extend(response.data)
+                if len(response.data) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch game index: {e}")
+
+        games_df = pd.DataFrame(rows, columns=['id', 'tipoff'])
+        if not games_df.empty:
+            games_df['tipoff'] = pd.to_datetime(games_df['tipoff'])
+        return games_df
+
+    def plan_shards(self, games_df: pd.DataFrame) -> List[Dict]:
+        """Partition games into fixed tipoff date-range shards."""
+        if games_df.empty:
+            return []
+
+        games_df = games_df.sort_values(['tipoff', 'id'])
+        dates = pd.to_datetime(games_df['tipoff']).dt.date
+
+        # Anchor buckets to the calendar so shard ids are stable across runs
+        buckets = dates.map(lambda d: d.toordinal() // self.shard_days)
+
+        shards = []
+        for bucket, group in games_df.groupby(buckets, sort=True):
+            start = datetime.fromordinal(bucket * self.shard_days).date()
+            end = datetime.fromordinal((bucket + 1) * self.shard_days - 1).date()
+            shards.append({
+                'shard_id': f"{start:%Y%m%d}-{end:%Y%m%d}",
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'game_ids': group['id'].tolist()
+            })
+
+        return shards
+
+    def run(self, games_df: Optional[pd.DataFrame] = None, start: Optional[str] = None,
+            end: Optional[str] = None) -> pd.DataFrame:
+        """Build features for all shards in a process pool and merge the results."""
+        if games_df is None:
+            games_df = self.fetch_game_index(self.builder_factory().supabase, start=start, end=end)
+
+        shards = self.plan_shards(games_df)
+        if not shards:
+            return pd.DataFrame()
+
+        output_paths = {}
+        failed_shards = []
+        self.failed_game_ids = []
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(shards)),
+                                 initializer=_init_worker, initargs=(self.builder_factory,)) as executor:
+            futures = {
+                executor.submit(_run_shard, shard, self.builder_factory, self.checkpoint_dir): shard
+                for shard in shards
+            }
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    output_path, failed = future.result()
+                except Exception as e:
+                    print(f"Warning: Failed to process shard {shard['shard_id']}: {e}")
+                    failed_shards.append(shard['shard_id'])
+                    continue
+
+                output_paths[shard['shard_id']] = output_path
+                self.failed_game_ids.extend(failed)
+
+        if self.failed_game_ids or failed_shards:
+            print(f"Warning: Partial backfill: {len(self.failed_game_ids)} games and "
+                  f"{len(failed_shards)} shards failed; rerun to retry them")
+
+        return self.merge([output_paths[s['shard_id']] for s in shards if s['shard_id'] in output_paths])
+
+    def merge(self, output_paths: List[str]) -> pd.DataFrame:
+        """Merge shard outputs into a single feature DataFrame."""
+        rows = []
+        for path in output_paths:
+            rows.extend(_load_shard_output(path))
+
+        if not rows:
+            return pd.DataFrame()
+
+        features_df = pd.DataFrame(rows)
+        return features_df.drop_duplicates(subset='game_id', keep='last').reset_index(drop=True)
+
+    def write_parquet(self, features_df: pd.DataFrame, path: str) -> None:
+        """Write merged features to a Parquet file (requires pyarrow or fastparquet)."""
+        try:
+            features_df.to_parquet(path, index=False)
+        except ImportError as e:
+            raise RuntimeError(f"Parquet output requires pyarrow or fastparquet: {e}")
+
+    def split_team_vectors(self, row: Dict) -> List[Dict]:
+        """Split a game feature row into home and away team vectors."""
+        # Paired home_*/away_* fields become unprefixed team fields; the rest
+        # (game metadata, market-wide odds, differentials) is shared
+        paired = {key[len('home_'):] for key in row
+                  if key.startswith('home_') and f"away_{key[len('home_'):]}" in row}
+
+        shared = {key: value for key, value in row.items()
+                  if not any(key == f"{side}_{name}" for side in ('home', 'away') for name in paired)}
+
+        vectors = []
+        for side in ('home', 'away'):
+            vector = dict(shared)
+            vector.update({name: row[f"{side}_{name}"] for name in paired})
+            vector['side'] = side
+            vectors.append(vector)
+        return vectors
+
+    def write_features_table(self, features_df: pd.DataFrame, supabase, batch_size: int = 500) -> int:
+        """Upsert merged features into the features table, one row per team per game."""
+        records = []
+        for row in features_df.to_dict(orient='records'):
+            for vector in self.split_team_vectors(row):
+                records.append({
+                    'game_id': row['game_id'],
+                    'team_id': vector.get('team') or vector['side'],
+                    'feature_vector': {key: _to_jsonable(value) for key, value in vector.items()},
+                    'feature_metadata': {'source': 'backfill', 'side': vector['side']}
+                })
+
+        try:
+            for i in range(0, len(records), batch_size):
+                supabase.table('features').upsert(records[i:i + batch_size]).execute()
+        except Exception as e:
+            raise RuntimeError(f"Failed to write features table: {e}")
+
+        return len(records)
+
+
+def create_backfill_runner(checkpoint_dir: str, max_workers: Optional[int] = None,
+                           shard_days: int = 7, run_id: Optional[str] = None) -> BackfillRunner:
+    """Factory function to create a BackfillRunner instance."""
+    return BackfillRunner(checkpoint_dir, max_workers=max_workers, shard_days=shard_days, run_id=run_id)
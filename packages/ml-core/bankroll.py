@@ -0,0 +1,310 @@
+"""
+NBA Bankroll Tracking Module
+
+Keeps the running bankroll balance and open bet exposure in memory,
+updated incrementally from bankroll_ledger and bets changes.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Bet statuses that still have stake at risk
+OPEN_BET_STATUSES = ('pending', 'placed')
+
+
+class BankrollTracker:
+    """Maintains bankroll balance and per-game / per-market open exposure."""
+
+    def __init__(self, balance: float = 0.0):
+        """Initialize an empty tracker with a starting balance."""
+        self._lock = threading.Lock()
+        self._balance = round(float(balance), 2)
+        self._last_ledger_at: Optional[str] = None
+        # Rows sharing the watermark timestamp, id -> (amount, balance_after)
+        self._boundary_entries: Dict[str, Optional[Tuple[float, float]]] = {}
+        # Bet ids changed by apply_bet while reload_open_bets is in flight
+        self._reload_touched: Optional[Set[str]] = None
+        self._open_bets: Dict[str, Dict] = {}
+        self._open_exposure = 0.0
+        self._game_exposure: Dict[str, float] = {}
+        self._market_exposure: Dict[Tuple[str, str], float] = {}
+
+    @property
+    def balance(self) -> float:
+        """Current bankroll balance."""
+        return self._balance
+
+    @property
+    def last_ledger_at(self) -> Optional[str]:
+        """Timestamp of the most recent ledger entry applied."""
+        return self._last_ledger_at
+
+    @property
+    def open_exposure(self) -> float:
+        """Total stake across all open bets."""
+        return self._open_exposure
+
+    def game_exposure(self, game_id: str) -> float:
+        """Open stake on a single game."""
+        return self._game_exposure.get(game_id, 0.0)
+
+    def market_exposure(self, game_id: str, market: str) -> float:
+        """Open stake on a single market of a game."""
+        return self._market_exposure.get((game_id, market), 0.0)
+
+    def apply_ledger_entry(self, entry: Dict) -> float:
+        """Apply a bankroll_ledger row idempotently and return the new balance."""
+        entry_id = entry.get('id')
+        created_at = entry.get('created_at')
+
+        with self._lock:
+            if created_at and self._last_ledger_at is not None:
+                # Older rows are already reflected in the authoritative balance_after
+                if created_at < self._last_ledger_at:
+                    return self._balance
+                # Same-timestamp siblings are deduplicated by id
+                if created_at == self._last_ledger_at and entry_id in self._boundary_entries:
+                    return self._balance
+
+            if created_at and (self._last_ledger_at is None or created_at > self._last_ledger_at):
+                self._last_ledger_at = created_at
+                self._boundary_entries = {}
+
+            if entry.get('balance_after') is None:
+                self._balance = round(self._balance + float(entry['amount']), 2)
+                chain_link = None
+            elif entry.get('amount') is None:
+                self._balance = round(float(entry['balance_after']), 2)
+                chain_link = None
+            else:
+                chain_link = (round(float(entry['amount']), 2), round(float(entry['balance_after']), 2))
+
+            if created_at and entry_id is not None:
+                self._boundary_entries[entry_id] = chain_link
+
+            if chain_link is not None:
+                # Siblings arrive in no fixed order, so take the end of their chain
+                tail = self._boundary_tail()
+                self._balance = tail if tail is not None else chain_link[1]
+
+            return self._balance
+
+    def apply_bet(self, bet: Dict) -> None:
+        """Apply a bets row insert or status change to the exposure index."""
+        bet_id = bet['id']
+
+        with self._lock:
+            # Drop any previous contribution so updates never double count
+            self._remove_open_bet(bet_id)
+
+            if bet.get('status', 'pending') in OPEN_BET_STATUSES:
+                self._add_open_bet(bet_id, bet['game_id'], bet['market'], float(bet['stake']))
+
+            if self._reload_touched is not None:
+                self._reload_touched.add(bet_id)
+
+    def kelly_stake(self, p_win: float, odds: float, k: float = 0.25) -> float:
+        """Fractional Kelly stake sized from the current balance."""
+        if not 0 < k <= 0.25:
+            raise ValueError("Kelly fraction k must be in (0, 0.25]")
+        if odds <= 1:
+            raise ValueError("Decimal odds must be greater than 1")
+
+        b = odds - 1
+        f_star = p_win - (1 - p_win) / b
+
+        if f_star <= 0:
+            return 0.0
+
+        return round(max(self._balance, 0.0) * f_star * k, 2)
+
+    def checkpoint(self, path: str) -> None:
+        """Write tracker state to a JSON checkpoint file."""
+        with self._lock:
+            state = {
+                'balance': self._balance,
+                'last_ledger_at': self._last_ledger_at,
+                'boundary_entries': self._boundary_entries,
+                'open_bets': self._open_bets,
+            }
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+
+        # Atomic swap so a crash mid-write never corrupts the checkpoint
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(cls, path: str) -> 'BankrollTracker':
+        """Rebuild a tracker from a JSON checkpoint file."""
+        with open(path) as f:
+            state = json.load(f)
+
+        tracker = cls(balance=state['balance'])
+        tracker._last_ledger_at = state.get('last_ledger_at')
+        tracker._boundary_entries = {
+            entry_id: tuple(link) if link is not None else None
+            for entry_id, link in state.get('boundary_entries', {}).items()
+        }
+
+        for bet_id, bet in state.get('open_bets', {}).items():
+            tracker._add_open_bet(bet_id, bet['game_id'], bet['market'], bet['stake'])
+
+        return tracker
+
+    def load(self, supabase, page_size: int = 1000) -> None:
+        """Seed state from Supabase using the latest balance and open bets only."""
+        try:
+            ledger_response = supabase.table('bankroll_ledger')\
+                .select('*')\
+                .order('created_at', desc=True)\
+                .limit(1)\
+                .execute()
+        except Exception as e:
+            raise RuntimeError(f"Failed to load bankroll state: {e}")
+
+        if ledger_response.data:
+            self.apply_ledger_entry(ledger_response.data[0])
+            # Pull in rows written in the same transaction as the latest one
+            self.sync(supabase, page_size=page_size)
+
+        self.reload_open_bets(supabase)
+
+    def reload_open_bets(self, supabase) -> None:
+        """Rebuild the exposure index from the currently open bets."""
+        with self._lock:
+            self._reload_touched = set()
+
+        try:
+            bets_response = supabase.table('bets')\
+                .select('*')\
+                .in_('status', list(OPEN_BET_STATUSES))\
+                .execute()
+        except Exception as e:
+            with self._lock:
+                self._reload_touched = None
+            raise RuntimeError(f"Failed to load open bets: {e}")
+
+        open_bets = {
+            bet['id']: {'game_id': bet['game_id'], 'market': bet['market'], 'stake': float(bet['stake'])}
+            for bet in bets_response.data
+            if bet.get('status', 'pending') in OPEN_BET_STATUSES
+        }
+
+        with self._lock:
+            # Realtime updates applied since the SELECT are newer than its rows
+            for bet_id in self._reload_touched:
+                if bet_id in self._open_bets:
+                    open_bets[bet_id] = self._open_bets[bet_id]
+                else:
+                    open_bets.pop(bet_id, None)
+            self._reload_touched = None
+
+            # Swap in a fully built index so readers never see a partial one
+            open_exposure, game_exposure, market_exposure = self._index_open_bets(open_bets)
+            self._open_bets = open_bets
+            self._open_exposure = open_exposure
+            self._game_exposure = game_exposure
+            self._market_exposure = market_exposure
+
+    def sync(self, supabase, page_size: int = 1000) -> List[Dict]:
+        """Apply ledger entries written at or after the last applied entry."""
+        entries = []
+        since = self._last_ledger_at
+        offset = 0
+
+        try:
+            while True:
+                query = supabase.table('bankroll_ledger').select('*')
+                if since is not None:
+                    # gte so same-timestamp siblings are seen; ids dedupe the boundary
+                    query = query.gte('created_at', since)
+                response = query.order('created_at')\
+                    .order('id')\
+                    .range(offset, offset + page_size - 1)\
+                    .execute()
+
+                entries.extend(response.data)
+                if len(response.data) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            raise RuntimeError(f"Failed to sync bankroll ledger: {e}")
+
+        for entry in entries:
+            self.apply_ledger_entry(entry)
+
+        return entries
+
+    def _boundary_tail(self) -> Optional[float]:
+        """balance_after of the last row in the watermark's same-timestamp chain."""
+        links = [link for link in self._boundary_entries.values() if link is not None]
+        # Each row starts from its predecessor's balance_after; the tail starts nothing
+        starts = {round(balance_after - amount, 2) for amount, balance_after in links}
+        tails = [balance_after for amount, balance_after in links if balance_after not in starts]
+        return tails[-1] if tails else None
+
+    @staticmethod
+    def _index_open_bets(open_bets: Dict[str, Dict]) -> Tuple[float, Dict[str, float], Dict[Tuple[str, str], float]]:
+        """Total, per-game and per-market stake for a set of open bets."""
+        open_exposure = 0.0
+        game_exposure: Dict[str, float] = {}
+        market_exposure: Dict[Tuple[str, str], float] = {}
+
+        for bet in open_bets.values():
+            game_id, market, stake = bet['game_id'], bet['market'], bet['stake']
+            open_exposure = round(open_exposure + stake, 2)
+            game_exposure[game_id] = round(game_exposure.get(game_id, 0.0) + stake, 2)
+            key = (game_id, market)
+            market_exposure[key] = round(market_exposure.get(key, 0.0) + stake, 2)
+
+        return open_exposure, game_exposure, market_exposure
+
+    def _add_open_bet(self, bet_id: str, game_id: str, market: str, stake: float) -> None:
+        """Record an open bet and add its stake to the exposure index."""
+        self._open_bets[bet_id] = {'game_id': game_id, 'market': market, 'stake': stake}
+        self._open_exposure = round(self._open_exposure + stake, 2)
+        self._game_exposure[game_id] = round(self._game_exposure.get(game_id, 0.0) + stake, 2)
+        key = (game_id, market)
+        self._market_exposure[key] = round(self._market_exposure.get(key, 0.0) + stake, 2)
+
+    def _remove_open_bet(self, bet_id: str) -> None:
+        """Forget an open bet and subtract its stake from the exposure index."""
+        bet = self._open_bets.pop(bet_id, None)
+        if bet is None:
+            return
+
+        game_id, market, stake = bet['game_id'], bet['market'], bet['stake']
+        self._open_exposure = round(self._open_exposure - stake, 2)
+
+        remaining = round(self._game_exposure.get(game_id, 0.0) - stake, 2)
+        if remaining > 0:
+            self._game_exposure[game_id] = remaining
+        else:
+            self._game_exposure.pop(game_id, None)
+
+        key = (game_id, market)
+        remaining = round(self._market_exposure.get(key, 0.0) - stake, 2)
+        if remaining > 0:
+            self._market_exposure[key] = remaining
+        else:
+            self._market_exposure.pop(key, None)
+
+
+def create_bankroll_tracker(supabase=None, checkpoint_path: Optional[str] = None) -> BankrollTracker:
+    """Factory function to create a BankrollTracker, restoring or loading state if possible."""
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        tracker = BankrollTracker.restore(checkpoint_path)
+        if supabase is not None:
+            # Bets may have settled while down; open bets are cheap to reload
+            tracker.sync(supabase)
+            tracker.reload_open_bets(supabase)
+        return tracker
+
+    tracker = BankrollTracker()
+    if supabase is not None:
+        tracker.load(supabase)
+    return tracker
@@ -10,10 +10,15 @@ import pandas as pd
 import numpy as np
 import requests
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+try:
+    from .odds_dedup import PAGE_SIZE, SNAPSHOT_COLUMNS, collapse_odds_snapshots
+except ImportError:
+    from odds_dedup import PAGE_SIZE, SNAPSHOT_COLUMNS, collapse_odds_snapshots
+
 # Load environment variables
 load_dotenv()
 
@@ -46,8 +51,35 @@ class FeatureBuilder:
         except Exception as e:
             raise RuntimeError(f"Failed to fetch games: {e}")
     
-    def fetch_odds_snapshots(self, game_id: str, limit: int = 10) -> pd.DataFrame:
-        """Fetch last N odds snapshots for a specific game."""
+    def fetch_upcoming_games(self, start: Optional[datetime] = None, hours: float = 24,
+                             limit: int = 100) -> pd.DataFrame:
+        """Fetch games tipping off within the next N hours, ordered by tipoff."""
+        start = start or datetime.now(timezone.utc)
+        end = start + timedelta(hours=hours)
+        
+        try:
+            response = self.supabase.table('games')\
+                .select('*')\
+                .gte('tipoff', start.isoformat())\
+                .lt('tipoff', end.isoformat())\
+                .order('tipoff')\
+                .limit(limit)\
+                .execute()
+            games_df = pd.DataFrame(response.data)
+            
+            if not games_df.empty:
+                games_df['tipoff'] = pd.to_datetime(games_df['tipoff'])
+                
+            return games_df
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch upcoming games: {e}")
+    
+    def fetch_odds_snapshots(self, game_id: str, limit: int = 10, dedupe: bool = False,
+                             scan_limit: int = 10 * PAGE_SIZE, page_size: int = PAGE_SIZE) -> pd.DataFrame:
+        """Fetch last N odds snapshots (or price-change segments if dedupe) for a specific game."""
+        if dedupe:
+            return self._fetch_odds_segments(game_id, limit, scan_limit, page_size)
+        
         try:
             response = self.supabase.table('odds_snapshots')\
                 .select('*')\
@@ -65,6 +97,57 @@ class FeatureBuilder:
         except Exception as e:
             raise RuntimeError(f"Failed to fetch odds for game {game_id}: {e}")
     
+    def _fetch_odds_segments(self, game_id: str, limit: int, scan_limit: int, page_size: int) -> pd.DataFrame:
+        """Page back through snapshots until the last N price segments are known to be complete."""
+        rows = []
+        offset = 0
+        exhausted = False
+        segments = pd.DataFrame()
+        # Start near the plain read's volume; grow only while segments are missing
+        batch = min(limit, page_size)
+        
+        try:
+            while offset < scan_limit:
+                batch = min(batch, scan_limit - offset)
+                response = self.supabase.table('odds_snapshots')\
+                    .select(SNAPSHOT_COLUMNS)\
+                    .eq('game_id', game_id)\
+                    .order('ts', desc=True)\
+                    .order('market')\
+                    .order('bookmaker')\
+                    .range(offset, offset + batch - 1)\
+                    .execute()
+                rows.extend(response.data)
+                offset += batch
+                
+                if len(response.data) < batch:
+                    exhausted = True
+                
+                if not rows:
+                    break
+                
+                segments = collapse_odds_snapshots(pd.DataFrame(rows), complete_history=exhausted)
+                
+                # Segments cut off at the scan boundary don't count as real line moves
+                if exhausted or (~segments['truncated']).sum() >= limit:
+                    break
+                
+                # Every series needs a price change in view, so scale by series count
+                num_series = segments[['market', 'bookmaker']].drop_duplicates().shape[0]
+                batch = min(max(limit * num_series, 2 * batch), page_size)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch odds for game {game_id}: {e}")
+        
+        if segments.empty:
+            return segments
+        
+        # Newest complete segments first; truncated ones only fill a short window
+        return segments\
+            .sort_values(['truncated', 'ts'], ascending=[True, False])\
+            .head(limit)\
+            .sort_values('ts', ascending=False)\
+            .reset_index(drop=True)
+    
     def fetch_team_stats(self, team_name: str) -> Dict:
         """Fetch team statistics from Ball Don't Lie API."""
         try:
@@ -189,37 +272,39 @@ class FeatureBuilder:
             raise ValueError(f"Game {game_id} not found")
         
         game = game_response.data[0]
-        home_team = game['home']
-        away_team = game['away']
-        tipoff = game['tipoff']
         
         try:
-            # Fetch odds snapshots (last 10)
-            odds_df = self.fetch_odds_snapshots(game_id, limit=10)
+            # Fetch odds snapshots (last 10 price changes)
+            odds_df = self.fetch_odds_snapshots(game_id, limit=10, dedupe=True)
             
             # Fetch team stats
-            home_stats = self.fetch_team_stats(home_team)
-            away_stats = self.fetch_team_stats(away_team)
-            
-            # Create feature groups
-            odds_features = self.create_odds_features(odds_df)
-            team_features = self.create_team_features(home_stats, away_stats)
+            home_stats = self.fetch_team_stats(game['home'])
+            away_stats = self.fetch_team_stats(game['away'])
             
-            # Combine all features
-            features = {
-                'game_id': game_id,
-                'home_team': home_team,
-                'away_team': away_team,
-                'tipoff': tipoff,
-                **odds_features,
-                **team_features
-            }
-            
-            return features
+            return self.assemble_features(game, odds_df, home_stats, away_stats)
             
         except Exception as e:
             raise RuntimeError(f"Failed to build features for game {game_id}: {e}")
     
+    def assemble_features(self, game: Dict, odds_df: pd.DataFrame, home_stats: Dict, away_stats: Dict) -> Dict:
+        """Combine a game row with already-fetched odds and team stats into a feature vector."""
+        # Create feature groups
+        odds_features = self.create_odds_features(odds_df)
+        team_features = self.create_team_features(home_stats, away_stats)
+        
+        # Normalize tipoff so raw rows and parsed DataFrame rows give identical, JSON-safe output
+        tipoff = pd.Timestamp(game['tipoff']).isoformat()
+        
+        # Combine all features
+        return {
+            'game_id': game['id'],
+            'home_team': game['home'],
+            'away_team': game['away'],
+            'tipoff': tipoff,
+            **odds_features,
+            **team_features
+        }
+    
     def build_features_dataset(self, game_ids: Optional[List[str]] = None, limit: int = 50) -> pd.DataFrame:
         """Build feature dataset for multiple games."""
         if game_ids is None:
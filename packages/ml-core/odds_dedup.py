@@ -0,0 +1,153 @@
+"""
+NBA Odds Snapshot Deduplication Module
+
+Collapses consecutive unchanged prices per (game, market, bookmaker)
+into run-length segments, on read or as a storage compaction job.
+"""
+
+import pandas as pd
+
+
+# Columns that define a price; a change in any of them starts a new segment
+PRICE_COLUMNS = ['home_odds', 'away_odds', 'home_point', 'away_point', 'over_under']
+
+# Columns identifying an independent price series
+SERIES_COLUMNS = ['game_id', 'market', 'bookmaker']
+
+# Columns read for deduplication; skips the raw_data jsonb payload
+SNAPSHOT_COLUMNS = ', '.join(['game_id', 'market', 'ts', 'bookmaker'] + PRICE_COLUMNS)
+
+# Matches the PostgREST max_rows cap in supabase/config.toml
+PAGE_SIZE = 1000
+
+
+def _sort_series(odds_df: pd.DataFrame) -> pd.DataFrame:
+    """Sort snapshots by series then timestamp, with ts parsed."""
+    odds_df = odds_df.copy()
+    odds_df['ts'] = pd.to_datetime(odds_df['ts'])
+    series_cols = [col for col in SERIES_COLUMNS if col in odds_df.columns]
+    return odds_df.sort_values(series_cols + ['ts'], kind='mergesort').reset_index(drop=True)
+
+
+def _segment_starts(odds_df: pd.DataFrame) -> pd.Series:
+    """Flag rows that begin a new price segment in a series-sorted frame."""
+    series_cols = [col for col in SERIES_COLUMNS if col in odds_df.columns]
+    price_cols = [col for col in PRICE_COLUMNS if col in odds_df.columns]
+
+    series = odds_df[series_cols]
+    prices = odds_df[price_cols]
+    prev_series = series.shift()
+    prev_prices = prices.shift()
+
+    series_changed = (series.ne(prev_series) & ~(series.isna() & prev_series.isna())).any(axis=1)
+    price_changed = (prices.ne(prev_prices) & ~(prices.isna() & prev_prices.isna())).any(axis=1)
+
+    starts = series_changed | price_changed
+    if len(starts):
+        starts.iloc[0] = True
+    return starts
+
+
+def collapse_odds_snapshots(odds_df: pd.DataFrame, complete_history: bool = True) -> pd.DataFrame:
+    """Collapse unchanged consecutive snapshots into one row per price segment."""
+    if odds_df.empty:
+        return odds_df.copy()
+
+    odds_df = _sort_series(odds_df)
+    starts = _segment_starts(odds_df)
+    grouped = odds_df.groupby(starts.cumsum())['ts']
+
+    # ts stays at the first sighting so sorting follows real line moves
+    odds_df['first_ts'] = odds_df['ts']
+    odds_df['last_ts'] = grouped.transform('max')
+    odds_df['num_snapshots'] = grouped.transform('size')
+
+    segments = odds_df[starts].reset_index(drop=True)
+
+    # With a partial read, each series' oldest segment may have started earlier
+    series_cols = [col for col in SERIES_COLUMNS if col in segments.columns]
+    if complete_history or not series_cols:
+        segments['truncated'] = False
+    else:
+        segments['truncated'] = segments.groupby(series_cols).cumcount() == 0
+
+    return segments
+
+
+def find_redundant_snapshots(odds_df: pd.DataFrame) -> pd.DataFrame:
+    """Return snapshots strictly inside a price segment (first and last are kept)."""
+    if odds_df.empty:
+        return odds_df.copy()
+
+    raw_ts = odds_df['ts']
+    odds_df = odds_df.assign(raw_ts=raw_ts)
+    odds_df = _sort_series(odds_df)
+
+    starts = _segment_starts(odds_df)
+    ends = starts.shift(-1, fill_value=True)
+
+    return odds_df[~starts & ~ends].reset_index(drop=True)
+
+
+def _redundant_ranges(odds_df: pd.DataFrame) -> pd.DataFrame:
+    """First and last raw ts of each segment with interior snapshots, per series."""
+    odds_df = _sort_series(odds_df.assign(raw_ts=odds_df['ts']))
+    starts = _segment_starts(odds_df)
+
+    segments = odds_df.groupby(starts.cumsum()).agg(
+        market=('market', 'first'),
+        bookmaker=('bookmaker', 'first'),
+        first_raw_ts=('raw_ts', 'first'),
+        last_raw_ts=('raw_ts', 'last'),
+        num_snapshots=('raw_ts', 'size')
+    )
+    return segments[segments['num_snapshots'] > 2].reset_index(drop=True)
+
+
+def compact_odds_snapshots(supabase, game_id: str, page_size: int = PAGE_SIZE) -> int:
+    """Delete redundant odds_snapshots rows for a game and return the count removed."""
+    rows = []
+    offset = 0
+
+    try:
+        while True:
+            # Order by the full primary key so pages never overlap or skip rows
+            response = supabase.table('odds_snapshots')\
+                .select(SNAPSHOT_COLUMNS)\
+                .eq('game_id', game_id)\
+                .order('ts')\
+                .order('market')\
+                .order('bookmaker')\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+
+            rows.extend(response.data)
+            if len(response.data) < page_size:
+                break
+            offset += page_size
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch odds for game {game_id}: {e}")
+
+    if not rows:
+        return 0
+
+    ranges = _redundant_ranges(pd.DataFrame(rows))
+    if ranges.empty:
+        return 0
+
+    try:
+        # Within a series every row strictly between a segment's ends belongs
+        # to it, so a range delete keeps the query string short on long runs
+        for segment in ranges.itertuples(index=False):
+            supabase.table('odds_snapshots')\
+                .delete()\
+                .eq('game_id', game_id)\
+                .eq('market', segment.market)\
+                .eq('bookmaker', segment.bookmaker)\
+                .gt('ts', segment.first_raw_ts)\
+                .lt('ts', segment.last_raw_ts)\
+                .execute()
+    except Exception as e:
+        raise RuntimeError(f"Failed to compact odds for game {game_id}: {e}")
+
+    return int((ranges['num_snapshots'] - 2).sum())
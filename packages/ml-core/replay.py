@@ -0,0 +1,298 @@
+"""
+NBA Odds Replay Module
+
+Re-emits recorded or synthetic odds_snapshots streams through the same
+Supabase query interface FeatureBuilder consumes, measuring event-to-feature
+latency, throughput and memory for game-night load tests.
+"""
+
+import hashlib
+import json
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .features import FeatureBuilder
+except ImportError:
+    from features import FeatureBuilder
+
+
+MIN_SPEED = 1.0
+MAX_SPEED = 1000.0
+
+
+class _ReplayResponse:
+    """Mimics the Supabase APIResponse data attribute."""
+
+    def __init__(self, data: List[Dict]):
+        self.data = data
+
+
+class _ReplayQuery:
+    """Subset of the Supabase query builder evaluated over in-memory rows."""
+
+    def __init__(self, rows: List[Dict]):
+        self._rows = rows
+        self._filters: List[Callable[[Dict], bool]] = []
+        self._order: List[tuple] = []
+        self._offset = 0
+        self._limit: Optional[int] = None
+
+    def select(self, columns: str = '*') -> '_ReplayQuery':
+        return self
+
+    def eq(self, column: str, value) -> '_ReplayQuery':
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column: str, value) -> '_ReplayQuery':
+        self._filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def gte(self, column: str, value) -> '_ReplayQuery':
+        self._filters.append(lambda row: row.get(column) is not None and row[column] >= value)
+        return self
+
+    def lt(self, column: str, value) -> '_ReplayQuery':
+        self._filters.append(lambda row: row.get(column) is not None and row[column] < value)
+        return self
+
+    def lte(self, column: str, value) -> '_ReplayQuery':
+        self._filters.append(lambda row: row.get(column) is not None and row[column] <= value)
+        return self
+
+    def in_(self, column: str, values) -> '_ReplayQuery':
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> '_ReplayQuery':
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, n: int) -> '_ReplayQuery':
+        self._limit = n
+        return self
+
+    def range(self, start: int, end: int) -> '_ReplayQuery':
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def execute(self) -> _ReplayResponse:
+        """Apply filters, ordering and limits to a snapshot of the table."""
+        rows = [row for row in self._rows if all(f(row) for f in self._filters)]
+
+        # Stable sorts from the last key back give multi-column ordering
+        for column, desc in reversed(self._order):
+            rows = sorted(rows, key=lambda row: row.get(column), reverse=desc)
+
+        end = None if self._limit is None else self._offset + self._limit
+        return _ReplayResponse([dict(row) for row in rows[self._offset:end]])
+
+
+class ReplayClient:
+    """In-memory stand-in for the Supabase client used during replay."""
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict]]] = None):
+        """Initialize with optional pre-loaded table rows."""
+        self.tables: Dict[str, List[Dict]] = {name: list(rows) for name, rows in (tables or {}).items()}
+
+    def table(self, name: str) -> _ReplayQuery:
+        """Start a query against a table, as supabase.Client.table does."""
+        return _ReplayQuery(self.tables.setdefault(name, []))
+
+    def insert(self, name: str, rows: List[Dict]) -> None:
+        """Append rows to a table, making them visible to later queries."""
+        self.tables.setdefault(name, []).extend(rows)
+
+
+class ReplayFeatureBuilder(FeatureBuilder):
+    """FeatureBuilder wired to a ReplayClient and recorded team stats."""
+
+    def __init__(self, client: ReplayClient, team_stats: Optional[Dict[str, Dict]] = None):
+        """Initialize without network clients or environment variables."""
+        self.supabase = client
+        self.team_stats = team_stats or {}
+
+    def fetch_team_stats(self, team_name: str) -> Dict:
+        """Return recorded team stats instead of calling Ball Don't Lie."""
+        return dict(self.team_stats.get(team_name, {}))
+
+
+def generate_synthetic_odds(game_ids: List[str], bookmakers: List[str], start: str,
+                            num_polls: int = 60, interval_seconds: int = 60,
+                            move_probability: float = 0.2, seed: int = 0) -> pd.DataFrame:
+    """Generate a reproducible h2h odds stream as a random walk per bookmaker."""
+    rng = np.random.RandomState(seed)
+    start_ts = pd.to_datetime(start)
+
+    rows = []
+    for game_id in game_ids:
+        for bookmaker in bookmakers:
+            home_odds = round(rng.uniform(1.5, 2.5), 2)
+            for poll in range(num_polls):
+                # Most polls repeat the previous price, like a live feed
+                if poll > 0 and rng.rand() < move_probability:
+                    home_odds = round(min(max(home_odds + rng.choice([-0.05, -0.02, 0.02, 0.05]), 1.05), 10.0), 2)
+                away_odds = round(1 / max(1 - 1 / home_odds, 0.01), 2)
+                rows.append({
+                    'game_id': game_id,
+                    'market': 'h2h',
+                    'ts': (start_ts + timedelta(seconds=poll * interval_seconds)).isoformat(),
+                    'bookmaker': bookmaker,
+                    'home_odds': home_odds,
+                    'away_odds': away_odds,
+                    'home_point': None,
+                    'away_point': None,
+                    'over_under': None
+                })
+
+    return pd.DataFrame(rows)
+
+
+def fetch_recording(supabase, game_ids: List[str], page_size: int = 1000) -> pd.DataFrame:
+    """Fetch the full recorded odds_snapshots history for a set of games."""
+    rows = []
+    offset = 0
+
+    try:
+        while True:
+            # Order by the full primary key so pages never overlap or skip rows
+            response = supabase.table('odds_snapshots')\
+                .select('*')\
+                .in_('game_id', game_ids)\
+                .order('ts')\
+                .order('game_id')\
+                .order('market')\
+                .order('bookmaker')\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+
+            rows.extend(response.data)
+            if len(response.data) < page_size:
+                break
+            offset += page_size
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch odds recording: {e}")
+
+    return pd.DataFrame(rows)
+
+
+class ReplaySimulator:
+    """Replays an odds stream at 1x-1000x and measures the feature pipeline."""
+
+    def __init__(self, recording: pd.DataFrame, games: List[Dict],
+                 team_stats: Optional[Dict[str, Dict]] = None, speed: float = 1.0,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Configure the recording, game rows, team stats and replay speed."""
+        if not MIN_SPEED <= speed <= MAX_SPEED:
+            raise ValueError(f"speed must be between {MIN_SPEED:g}x and {MAX_SPEED:g}x")
+
+        self.recording = recording
+        self.games = games
+        self.team_stats = team_stats or {}
+        self.speed = speed
+        self.clock = clock
+        self.sleep = sleep
+
+    def _events(self) -> List[tuple]:
+        """Group recorded snapshots into (ts, game_id, rows) poll events."""
+        if self.recording.empty:
+            return []
+
+        recording = self.recording.copy()
+        recording['_ts'] = pd.to_datetime(recording['ts'])
+        recording = recording.sort_values(['_ts', 'game_id'], kind='mergesort')
+
+        events = []
+        for (ts, game_id), group in recording.groupby(['_ts', 'game_id'], sort=True):
+            rows = group.drop(columns='_ts').to_dict(orient='records')
+            events.append((ts, game_id, rows))
+        return events
+
+    def _replay(self, events: List[tuple], paced: bool) -> Tuple[List[Dict], List[float], int, float]:
+        """Emit events into a fresh client, returning features, latencies, snapshots and elapsed."""
+        client = ReplayClient({'games': self.games})
+        builder = ReplayFeatureBuilder(client, self.team_stats)
+
+        features_list = []
+        latencies = []
+        snapshots = 0
+
+        start_wall = self.clock()
+        first_ts = events[0][0] if events else None
+
+        for ts, game_id, rows in events:
+            due = start_wall + (ts - first_ts).total_seconds() / self.speed if paced else self.clock()
+            wait = due - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+
+            client.insert('odds_snapshots', rows)
+            snapshots += len(rows)
+
+            features = builder.build_features_for_game(game_id)
+            latencies.append(self.clock() - due)
+            features_list.append({'event_ts': ts.isoformat(), **features})
+
+        return features_list, latencies, snapshots, self.clock() - start_wall
+
+    def measure_memory(self) -> float:
+        """Peak traced memory in MB for an unpaced replay of the recording."""
+        events = self._events()
+
+        tracemalloc.start()
+        try:
+            self._replay(events, paced=False)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return peak_memory / 1e6
+
+    def run(self, track_memory: bool = False) -> Dict:
+        """Replay every event, rebuilding features for its game, and report metrics."""
+        events = self._events()
+
+        # Timed pass runs untraced; tracemalloc's per-allocation overhead
+        # would inflate latency and deflate throughput
+        features_list, latencies, snapshots, elapsed = self._replay(events, paced=True)
+        latencies_ms = np.array(latencies) * 1000
+
+        return {
+            'speed': self.speed,
+            'events': len(events),
+            'snapshots': snapshots,
+            'elapsed_s': elapsed,
+            'throughput_eps': len(events) / elapsed if elapsed > 0 else np.nan,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else np.nan,
+                'p95': float(np.percentile(latencies_ms, 95)) if len(latencies_ms) else np.nan,
+                'p99': float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else np.nan,
+                'max': float(latencies_ms.max()) if len(latencies_ms) else np.nan
+            },
+            # Memory comes from a separate untimed pass when requested
+            'peak_memory_mb': self.measure_memory() if track_memory else None,
+            'features': features_list,
+            'fingerprint': feature_fingerprint(features_list)
+        }
+
+
+def feature_fingerprint(features_list: List[Dict]) -> str:
+    """Stable hash of replay feature outputs for cross-run correctness checks."""
+    payload = json.dumps(features_list, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def create_replay_simulator(recording: pd.DataFrame, games: List[Dict],
+                            team_stats: Optional[Dict[str, Dict]] = None,
+                            speed: float = 1.0) -> ReplaySimulator:
+    """Factory function to create a ReplaySimulator instance."""
+    return ReplaySimulator(recording, games, team_stats=team_stats, speed=speed)
@@ -0,0 +1,199 @@
+"""
+NBA Slate Schedule Module
+
+Keeps a tipoff-ordered index of upcoming games and prefetches odds and
+team data so features are already hot when a pre-game prediction runs.
+"""
+
+import bisect
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .features import create_feature_builder
+except ImportError:
+    from features import create_feature_builder
+
+
+# (seconds to tipoff, refresh interval seconds); closer games refresh faster
+DEFAULT_REFRESH_TIERS = [
+    (15 * 60, 30),
+    (60 * 60, 60),
+    (3 * 60 * 60, 300),
+]
+DEFAULT_REFRESH_INTERVAL = 900
+
+
+class SlateScheduler:
+    """Tipoff-ordered schedule index with look-ahead feature prefetching."""
+
+    def __init__(self, builder, horizon_minutes: int = 180, index_hours: int = 24,
+                 refresh_tiers: Optional[List[Tuple[int, int]]] = None,
+                 team_stats_ttl: int = 6 * 60 * 60, index_refresh_seconds: int = 600,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        """Configure the feature builder, prefetch horizon and refresh tiers."""
+        self.builder = builder
+        self.horizon = timedelta(minutes=horizon_minutes)
+        self.index_hours = index_hours
+        self.refresh_tiers = sorted(refresh_tiers or DEFAULT_REFRESH_TIERS)
+        self.team_stats_ttl = timedelta(seconds=team_stats_ttl)
+        self.index_refresh = timedelta(seconds=index_refresh_seconds)
+        self.clock = clock
+
+        self._index: List[Tuple[pd.Timestamp, str]] = []
+        self._games: Dict[str, Dict] = {}
+        self._features: Dict[str, Dict] = {}
+        self._warmed_at: Dict[str, datetime] = {}
+        self._team_stats: Dict[str, Tuple[datetime, Dict]] = {}
+        self._index_loaded_at: Optional[datetime] = None
+
+    @property
+    def games(self) -> List[str]:
+        """Indexed game ids in tipoff order."""
+        return [game_id for _, game_id in self._index]
+
+    def load(self, now: Optional[datetime] = None) -> int:
+        """Rebuild the index from games tipping off within index_hours."""
+        now = now or self.clock()
+        games_df = self.builder.fetch_upcoming_games(start=now, hours=self.index_hours)
+
+        previous = self._games
+        self._index = []
+        self._games = {}
+        for game in games_df.to_dict(orient='records'):
+            # A changed row (e.g. rescheduled tipoff) invalidates prefetched features
+            if game['id'] in previous and previous[game['id']] != game:
+                self._forget(game['id'])
+            self.add_game(game)
+
+        # Forget prefetched state for games no longer on the slate
+        for game_id in list(self._features):
+            if game_id not in self._games:
+                self._forget(game_id)
+
+        self._index_loaded_at = now
+        return len(self._index)
+
+    def add_game(self, game: Dict) -> None:
+        """Insert or reschedule a single game, keeping tipoff order."""
+        game_id = game['id']
+        if game_id in self._games:
+            self.remove_game(game_id)
+
+        tipoff = pd.Timestamp(game['tipoff'])
+        bisect.insort(self._index, (tipoff, game_id))
+        self._games[game_id] = game
+
+    def remove_game(self, game_id: str) -> None:
+        """Drop a game from the index and its prefetched state."""
+        game = self._games.pop(game_id, None)
+        if game is not None:
+            key = (pd.Timestamp(game['tipoff']), game_id)
+            i = bisect.bisect_left(self._index, key)
+            if i < len(self._index) and self._index[i] == key:
+                del self._index[i]
+        self._forget(game_id)
+
+    def prune(self, now: Optional[datetime] = None) -> List[str]:
+        """Remove games that have already tipped off."""
+        now = now or self.clock()
+        started = []
+        while self._index and self._index[0][0] <= now:
+            _, game_id = self._index[0]
+            self.remove_game(game_id)
+            started.append(game_id)
+        return started
+
+    def upcoming(self, now: Optional[datetime] = None, within: Optional[timedelta] = None) -> List[str]:
+        """Game ids tipping off within the window (default: prefetch horizon)."""
+        now = now or self.clock()
+        end = pd.Timestamp(now + (within if within is not None else self.horizon))
+        i = bisect.bisect_right(self._index, (pd.Timestamp(now), chr(0x10FFFF)))
+        j = bisect.bisect_left(self._index, (end, ''))
+        return [game_id for _, game_id in self._index[i:j]]
+
+    def refresh_interval(self, game_id: str, now: Optional[datetime] = None) -> float:
+        """Seconds between refreshes for a game, shorter as tipoff nears."""
+        now = now or self.clock()
+        seconds_to_tipoff = (pd.Timestamp(self._games[game_id]['tipoff']) - pd.Timestamp(now)).total_seconds()
+
+        for threshold, interval in self.refresh_tiers:
+            if seconds_to_tipoff <= threshold:
+                return interval
+        return DEFAULT_REFRESH_INTERVAL
+
+    def due_games(self, now: Optional[datetime] = None) -> List[str]:
+        """Games inside the horizon whose prefetched features are stale, soonest first."""
+        now = now or self.clock()
+        due = []
+        for game_id in self.upcoming(now):
+            warmed_at = self._warmed_at.get(game_id)
+            if warmed_at is None or (now - warmed_at).total_seconds() >= self.refresh_interval(game_id, now):
+                due.append(game_id)
+        return due
+
+    def warm(self, game_id: str, now: Optional[datetime] = None) -> Dict:
+        """Prefetch odds and team stats for a game and cache its features."""
+        now = now or self.clock()
+        game = self._games[game_id]
+
+        odds_df = self.builder.fetch_odds_snapshots(game_id, limit=10, dedupe=True)
+        home_stats = self._get_team_stats(game['home'], now)
+        away_stats = self._get_team_stats(game['away'], now)
+
+        features = self.builder.assemble_features(game, odds_df, home_stats, away_stats)
+        self._features[game_id] = features
+        self._warmed_at[game_id] = now
+        return features
+
+    def tick(self, now: Optional[datetime] = None) -> List[str]:
+        """Run one scheduling pass: reload the index if stale, prune, warm due games."""
+        now = now or self.clock()
+
+        if self._index_loaded_at is None or now - self._index_loaded_at >= self.index_refresh:
+            self.load(now)
+        self.prune(now)
+
+        warmed = []
+        for game_id in self.due_games(now):
+            try:
+                self.warm(game_id, now)
+                warmed.append(game_id)
+            except Exception as e:
+                print(f"Warning: Failed to prefetch game {game_id}: {e}")
+        return warmed
+
+    def get_features(self, game_id: str, now: Optional[datetime] = None) -> Dict:
+        """Return hot features for a game, warming or building on a miss."""
+        now = now or self.clock()
+
+        if game_id not in self._games:
+            return self.builder.build_features_for_game(game_id)
+
+        warmed_at = self._warmed_at.get(game_id)
+        if warmed_at is None or (now - warmed_at).total_seconds() >= self.refresh_interval(game_id, now):
+            return self.warm(game_id, now)
+
+        return self._features[game_id]
+
+    def _get_team_stats(self, team_name: str, now: datetime) -> Dict:
+        """Team stats shared across the slate, refetched after team_stats_ttl."""
+        cached = self._team_stats.get(team_name)
+        if cached is not None and now - cached[0] < self.team_stats_ttl:
+            return cached[1]
+
+        stats = self.builder.fetch_team_stats(team_name)
+        self._team_stats[team_name] = (now, stats)
+        return stats
+
+    def _forget(self, game_id: str) -> None:
+        """Drop cached features for a game."""
+        self._features.pop(game_id, None)
+        self._warmed_at.pop(game_id, None)
+
+
+def create_slate_scheduler(builder=None, horizon_minutes: int = 180) -> SlateScheduler:
+    """Factory function to create a SlateScheduler over a FeatureBuilder."""
+    return SlateScheduler(builder or create_feature_builder(), horizon_minutes=horizon_minutes)
@@ -0,0 +1,274 @@
+"""
+Unit tests for NBA Feature Backfill Module
+
+Tests shard planning, per-shard checkpoint resume and output merging
+against a local fake feature builder.
+"""
+
+import json
+import os
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+
+from backfill import BackfillRunner, _run_shard
+
+
+class FakeFeatureBuilder:
+    """Local stand-in for FeatureBuilder that needs no network clients."""
+
+    def build_features_for_game(self, game_id):
+        if game_id == 'game-bad':
+            raise RuntimeError("API Error")
+        return {
+            'game_id': game_id,
+            'latest_home_odds': np.float64(1.95),
+            'home_odds_trend': np.nan,
+            'num_bookmakers': np.int64(2)
+        }
+
+
+def fake_builder_factory():
+    """Module-level factory so worker processes can unpickle it."""
+    return FakeFeatureBuilder()
+
+
+class FlakyFeatureBuilder:
+    """Fake builder whose bad game fails on the first attempt only."""
+
+    def __init__(self, marker_path):
+        self.marker_path = marker_path
+
+    def build_features_for_game(self, game_id):
+        if game_id == 'game-bad' and not os.path.exists(self.marker_path):
+            open(self.marker_path, 'w').close()
+            raise RuntimeError("API Error")
+        return {'game_id': game_id, 'latest_home_odds': 1.95}
+
+
+def flaky_builder_factory(marker_path):
+    """Module-level factory for the flaky builder, bound with functools.partial."""
+    return FlakyFeatureBuilder(marker_path)
+
+
+class BusyFeatureBuilder:
+    """Fake builder doing CPU-bound work, reporting which process built each game."""
+
+    def build_features_for_game(self, game_id):
+        total = 0
+        for i in range(300000):
+            total += i * i
+        return {'game_id': game_id, 'pid': os.getpid(), 'builder': id(self), 'checksum': total}
+
+
+def busy_builder_factory():
+    """Module-level factory for the CPU-bound fake builder."""
+    return BusyFeatureBuilder()
+
+
+class TestBackfillRunner:
+    """Test suite for BackfillRunner class using static fixtures."""
+
+    @pytest.fixture
+    def sample_games_df(self):
+        """Static fixture for a game index spanning several weeks."""
+        games_df = pd.DataFrame([
+            {'id': 'game-1', 'tipoff': '2024-01-01T19:00:00Z'},
+            {'id': 'game-2', 'tipoff': '2024-01-02T20:00:00Z'},
+            {'id': 'game-3', 'tipoff': '2024-01-09T19:30:00Z'},
+            {'id': 'game-4', 'tipoff': '2024-01-20T19:00:00Z'},
+            {'id': 'game-bad', 'tipoff': '2024-01-20T21:00:00Z'}
+        ])
+        games_df['tipoff'] = pd.to_datetime(games_df['tipoff'])
+        return games_df
+
+    @pytest.fixture
+    def runner(self, tmp_path):
+        """Runner writing checkpoints to a temporary directory."""
+        return BackfillRunner(str(tmp_path / 'ckpt'), builder_factory=fake_builder_factory, max_workers=2)
+
+    def test_plan_shards_by_date_range(self, runner, sample_games_df):
+        """Test games are partitioned into stable tipoff date-range shards."""
+        shards = runner.plan_shards(sample_games_df)
+
+        assert [len(s['game_ids']) for s in shards] == [2, 1, 2]
+        assert sum(len(s['game_ids']) for s in shards) == len(sample_games_df)
+        assert len({s['shard_id'] for s in shards}) == len(shards)
+        assert runner.plan_shards(sample_games_df.iloc[::-1]) == shards
+
+    def test_plan_shards_empty(self, runner):
+        """Test no shards are planned for an empty game index."""
+        assert runner.plan_shards(pd.DataFrame(columns=['id', 'tipoff'])) == []
+
+    def test_invalid_shard_days(self, tmp_path):
+        """Test shard size must be positive."""
+        with pytest.raises(ValueError, match="shard_days"):
+            BackfillRunner(str(tmp_path), builder_factory=fake_builder_factory, shard_days=0)
+
+    def test_run_merges_all_shards(self, runner, sample_games_df):
+        """Test a full run builds every game across worker processes."""
+        features_df = runner.run(games_df=sample_games_df)
+
+        assert sorted(features_df['game_id']) == ['game-1', 'game-2', 'game-3', 'game-4']
+        assert features_df['latest_home_odds'].iloc[0] == 1.95
+        assert features_df['home_odds_trend'].isna().all()
+
+        # The shard holding the failed game is not marked done
+        assert sorted(p for p in os.listdir(runner.checkpoint_dir) if p.endswith('.done')) == \
+            ['20231231-20240106.done', '20240107-20240113.done']
+        assert runner.failed_game_ids == ['game-bad']
+
+    def test_failed_games_retried_on_next_run(self, sample_games_df, tmp_path):
+        """Test a failed game is retried and completes its shard on a later run."""
+        factory = partial(flaky_builder_factory, str(tmp_path / 'failed-once'))
+        runner = BackfillRunner(str(tmp_path / 'ckpt'), builder_factory=factory, max_workers=2)
+
+        runner.run(games_df=sample_games_df)
+        failed_path = os.path.join(runner.checkpoint_dir, '20240114-20240120.failed.json')
+        with open(failed_path) as f:
+            assert json.load(f) == ['game-bad']
+        assert runner.failed_game_ids == ['game-bad']
+
+        # Transient error cleared: the same game index retries the failed game
+        features_df = runner.run(games_df=sample_games_df)
+
+        assert 'game-bad' in set(features_df['game_id'])
+        assert len(features_df) == len(sample_games_df)
+        assert runner.failed_game_ids == []
+        assert os.path.exists(os.path.join(runner.checkpoint_dir, '20240114-20240120.done'))
+        assert not os.path.exists(failed_path)
+
+    def test_done_marker_ignored_when_game_set_changes(self, tmp_path):
+        """Test a shard done for a narrower game set is rebuilt for a wider one."""
+        checkpoint_dir = str(tmp_path)
+        shard = {'shard_id': '20240101-20240107', 'game_ids': ['game-3']}
+        _run_shard(shard, fake_builder_factory, checkpoint_dir)
+
+        wider = {**shard, 'game_ids': ['game-1', 'game-2', 'game-3']}
+        output_path, failed = _run_shard(wider, fake_builder_factory, checkpoint_dir)
+
+        with open(output_path) as f:
+            built = sorted(json.loads(line)['game_id'] for line in f)
+        assert built == ['game-1', 'game-2', 'game-3']
+        assert failed == []
+
+    def test_run_id_namespaces_checkpoints(self, tmp_path):
+        """Test a new run_id starts from an empty checkpoint directory."""
+        runner = BackfillRunner(str(tmp_path), builder_factory=fake_builder_factory, run_id='schema-v2')
+
+        assert runner.checkpoint_dir == os.path.join(str(tmp_path), 'schema-v2')
+        assert os.path.isdir(runner.checkpoint_dir)
+
+    def test_pool_spreads_shards_across_processes(self, tmp_path, sample_games_df):
+        """Test shards are built in more than one worker process."""
+        runner = BackfillRunner(str(tmp_path), builder_factory=busy_builder_factory, max_workers=3, shard_days=1)
+
+        features_df = runner.run(games_df=sample_games_df)
+
+        assert features_df['pid'].nunique() > 1
+        assert os.getpid() not in set(features_df['pid'])
+        # One builder per worker process, reused across its shards
+        assert (features_df.groupby('pid')['builder'].nunique() == 1).all()
+
+    @pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="speedup needs at least 4 cores")
+    def test_pool_speedup_scales_with_workers(self, tmp_path):
+        """Test CPU-bound shards finish close to linearly faster with more workers."""
+        games_df = pd.DataFrame({
+            'id': [f"game-{i}" for i in range(32)],
+            'tipoff': pd.date_range('2024-01-01', periods=32, freq='D', tz='UTC')
+        })
+
+        timings = {}
+        for workers in (1, 4):
+            runner = BackfillRunner(str(tmp_path / f"w{workers}"), builder_factory=busy_builder_factory,
+                                    max_workers=workers, shard_days=1)
+            start = time.perf_counter()
+            runner.run(games_df=games_df)
+            timings[workers] = time.perf_counter() - start
+
+        assert timings[1] / timings[4] > 2.5
+
+    def test_run_shard_resumes_from_checkpoint(self, tmp_path):
+        """Test a crashed shard skips games already written and drops torn lines."""
+        checkpoint_dir = str(tmp_path)
+        shard = {'shard_id': '20240101-20240107', 'game_ids': ['game-1', 'game-2']}
+        output_path = os.path.join(checkpoint_dir, '20240101-20240107.jsonl')
+
+        with open(output_path, 'w') as f:
+            f.write(json.dumps({'game_id': 'game-1', 'latest_home_odds': 2.5}) + '\n')
+            f.write('{"game_id": "game-2", "lat')
+
+        _, failed = _run_shard(shard, fake_builder_factory, checkpoint_dir)
+
+        with open(output_path) as f:
+            rows = [json.loads(line) for line in f]
+
+        assert [row['game_id'] for row in rows] == ['game-1', 'game-2']
+        assert rows[0]['latest_home_odds'] == 2.5
+        assert failed == []
+        assert os.path.exists(os.path.join(checkpoint_dir, '20240101-20240107.done'))
+
+    def test_run_shard_skips_completed(self, tmp_path):
+        """Test shards with a done marker are not rebuilt."""
+        checkpoint_dir = str(tmp_path)
+        shard = {'shard_id': 'done-shard', 'game_ids': ['game-1']}
+        _run_shard(shard, fake_builder_factory, checkpoint_dir)
+
+        factory = Mock()
+        _run_shard(shard, factory, checkpoint_dir)
+
+        factory.assert_not_called()
+
+    def test_fetch_game_index_paginates(self, runner):
+        """Test the game index is fetched page by page in tipoff order."""
+        supabase = Mock()
+        query = supabase.table.return_value.select.return_value.gte.return_value
+
+        first_page = Mock()
+        first_page.data = [{'id': 'game-1', 'tipoff': '2024-01-01T19:00:00Z'},
+                           {'id': 'game-2', 'tipoff': '2024-01-02T19:00:00Z'}]
+        second_page = Mock()
+        second_page.data = [{'id': 'game-3', 'tipoff': '2024-01-03T19:00:00Z'}]
+        query.order.return_value.range.return_value.execute.side_effect = [first_page, second_page]
+
+        games_df = runner.fetch_game_index(supabase, start='2024-01-01', page_size=2)
+
+        assert list(games_df['id']) == ['game-1', 'game-2', 'game-3']
+        assert isinstance(games_df.iloc[0]['tipoff'], pd.Timestamp)
+        query.order.assert_called_with('tipoff')
+
+    def test_write_features_table(self, runner):
+        """Test merged features are upserted as one JSON-safe vector per team."""
+        features_df = pd.DataFrame([{
+            'game_id': 'game-1',
+            'home_team': 'Los Angeles Lakers',
+            'away_team': 'Boston Celtics',
+            'latest_home_odds': 1.95,
+            'home_odds_trend': np.nan,
+            'away_odds_trend': 0.01,
+            'home_avg_points': 118.5,
+            'away_avg_points': 121.2,
+            'points_differential': -2.7
+        }])
+        supabase = Mock()
+
+        written = runner.write_features_table(features_df, supabase)
+
+        assert written == 2
+        home, away = supabase.table.return_value.upsert.call_args[0][0]
+        assert (home['game_id'], home['team_id']) == ('game-1', 'Los Angeles Lakers')
+        assert (away['game_id'], away['team_id']) == ('game-1', 'Boston Celtics')
+        assert home['feature_vector']['avg_points'] == 118.5
+        assert away['feature_vector']['avg_points'] == 121.2
+        assert home['feature_vector']['odds_trend'] is None
+        assert 'home_avg_points' not in away['feature_vector']
+        assert away['feature_vector']['points_differential'] == -2.7
+        assert away['feature_vector']['latest_home_odds'] == 1.95
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,271 @@
+"""
+Unit tests for NBA Bankroll Tracking Module
+
+Tests incremental balance and exposure updates, checkpointing,
+and seeding from static Supabase fixtures.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from bankroll import BankrollTracker, create_bankroll_tracker
+
+
+class TestBankrollTracker:
+    """Test suite for BankrollTracker class using static fixtures."""
+
+    @pytest.fixture
+    def sample_ledger_data(self):
+        """Static fixture for bankroll_ledger rows."""
+        return [
+            {
+                'id': 'ledger-1',
+                'transaction_type': 'deposit',
+                'amount': 1000.00,
+                'balance_after': 1000.00,
+                'bet_id': None,
+                'created_at': '2024-01-15T12:00:00Z'
+            },
+            {
+                'id': 'ledger-2',
+                'transaction_type': 'bet_placed',
+                'amount': -50.00,
+                'balance_after': 950.00,
+                'bet_id': 'bet-1',
+                'created_at': '2024-01-15T18:00:00Z'
+            }
+        ]
+
+    @pytest.fixture
+    def sample_bets_data(self):
+        """Static fixture for bets rows."""
+        return [
+            {
+                'id': 'bet-1',
+                'game_id': 'game-123',
+                'market': 'h2h',
+                'selection': 'home',
+                'stake': 50.00,
+                'odds': 1.95,
+                'status': 'placed'
+            },
+            {
+                'id': 'bet-2',
+                'game_id': 'game-123',
+                'market': 'totals',
+                'selection': 'over',
+                'stake': 25.00,
+                'odds': 1.90,
+                'status': 'pending'
+            },
+            {
+                'id': 'bet-3',
+                'game_id': 'game-456',
+                'market': 'h2h',
+                'selection': 'away',
+                'stake': 40.00,
+                'odds': 2.10,
+                'status': 'placed'
+            }
+        ]
+
+    @pytest.fixture
+    def tracker(self, sample_bets_data):
+        """Tracker with a balance and the sample open bets applied."""
+        tracker = BankrollTracker(balance=950.00)
+        for bet in sample_bets_data:
+            tracker.apply_bet(bet)
+        return tracker
+
+    def test_apply_ledger_entries(self, sample_ledger_data):
+        """Test balance follows ledger amounts incrementally."""
+        tracker = BankrollTracker()
+
+        for entry in sample_ledger_data:
+            tracker.apply_ledger_entry(entry)
+
+        assert tracker.balance == 950.00
+        assert tracker.last_ledger_at == '2024-01-15T18:00:00Z'
+
+    def test_exposure_index(self, tracker):
+        """Test per-game and per-market exposure from open bets."""
+        assert tracker.open_exposure == 115.00
+        assert tracker.game_exposure('game-123') == 75.00
+        assert tracker.game_exposure('game-456') == 40.00
+        assert tracker.market_exposure('game-123', 'h2h') == 50.00
+        assert tracker.market_exposure('game-123', 'totals') == 25.00
+        assert tracker.game_exposure('game-999') == 0.0
+
+    def test_settled_bet_releases_exposure(self, tracker, sample_bets_data):
+        """Test status change to a settled state removes exposure."""
+        settled = {**sample_bets_data[0], 'status': 'won'}
+        tracker.apply_bet(settled)
+
+        assert tracker.open_exposure == 65.00
+        assert tracker.game_exposure('game-123') == 25.00
+        assert tracker.market_exposure('game-123', 'h2h') == 0.0
+
+    def test_repeated_bet_update_not_double_counted(self, tracker, sample_bets_data):
+        """Test re-applying an open bet replaces its previous contribution."""
+        tracker.apply_bet({**sample_bets_data[1], 'status': 'placed'})
+
+        assert tracker.open_exposure == 115.00
+        assert tracker.market_exposure('game-123', 'totals') == 25.00
+
+    def test_kelly_stake(self):
+        """Test fractional Kelly sizing reads the current balance."""
+        tracker = BankrollTracker(balance=1000.00)
+
+        # f* = 0.55 - 0.45 / 1.0 = 0.10
+        assert tracker.kelly_stake(0.55, 2.0, k=0.25) == 25.00
+        assert tracker.kelly_stake(0.40, 2.0) == 0.0
+
+        with pytest.raises(ValueError, match="Kelly fraction"):
+            tracker.kelly_stake(0.55, 2.0, k=0.5)
+
+    def test_checkpoint_and_restore(self, tracker, tmp_path):
+        """Test checkpointed state round-trips through restore."""
+        tracker.apply_ledger_entry({'amount': 10.00, 'created_at': '2024-01-15T19:00:00Z'})
+        path = str(tmp_path / 'bankroll.json')
+
+        tracker.checkpoint(path)
+        restored = BankrollTracker.restore(path)
+
+        assert restored.balance == 960.00
+        assert restored.last_ledger_at == '2024-01-15T19:00:00Z'
+        assert restored.open_exposure == tracker.open_exposure
+        assert restored.market_exposure('game-123', 'totals') == 25.00
+
+    def test_load_from_supabase(self, sample_ledger_data, sample_bets_data):
+        """Test seeding reads the latest ledger row and open bets only."""
+        supabase = Mock()
+
+        ledger_response = Mock()
+        ledger_response.data = [sample_ledger_data[-1]]
+        supabase.table.return_value.select.return_value.order.return_value.limit.return_value.execute.return_value = ledger_response
+
+        sync_response = Mock()
+        sync_response.data = [sample_ledger_data[-1]]
+        supabase.table.return_value.select.return_value.gte.return_value.order.return_value.order.return_value\
+            .range.return_value.execute.return_value = sync_response
+
+        bets_response = Mock()
+        bets_response.data = sample_bets_data
+        supabase.table.return_value.select.return_value.in_.return_value.execute.return_value = bets_response
+
+        tracker = create_bankroll_tracker(supabase)
+
+        assert tracker.balance == 950.00
+        assert tracker.open_exposure == 115.00
+        supabase.table.return_value.select.return_value.in_.assert_called_once_with('status', ['pending', 'placed'])
+
+    def test_restore_then_sync(self, tracker, sample_ledger_data, sample_bets_data, tmp_path):
+        """Test factory restores a checkpoint, applies newer ledger rows and reloads open bets."""
+        path = str(tmp_path / 'bankroll.json')
+        tracker.apply_ledger_entry(sample_ledger_data[-1])
+        tracker.checkpoint(path)
+
+        supabase = Mock()
+        sync_response = Mock()
+        sync_response.data = [
+            sample_ledger_data[-1],
+            {'id': 'ledger-3', 'amount': 95.00, 'balance_after': 1045.00, 'created_at': '2024-01-15T23:00:00Z'}
+        ]
+        supabase.table.return_value.select.return_value.gte.return_value.order.return_value.order.return_value\
+            .range.return_value.execute.return_value = sync_response
+
+        # bet-1 and bet-3 settled while the process was down
+        bets_response = Mock()
+        bets_response.data = [sample_bets_data[1]]
+        supabase.table.return_value.select.return_value.in_.return_value.execute.return_value = bets_response
+
+        restored = create_bankroll_tracker(supabase, checkpoint_path=path)
+
+        assert restored.balance == 1045.00
+        assert restored.open_exposure == 25.00
+        assert restored.game_exposure('game-456') == 0.0
+        supabase.table.return_value.select.return_value.gte.assert_called_once_with('created_at', '2024-01-15T18:00:00Z')
+
+    def test_ledger_entry_idempotent(self, sample_ledger_data):
+        """Test entries delivered twice, or older than the watermark, are not re-applied."""
+        tracker = BankrollTracker()
+
+        for entry in sample_ledger_data + sample_ledger_data:
+            tracker.apply_ledger_entry(entry)
+
+        assert tracker.balance == 950.00
+
+    def test_ledger_same_timestamp_siblings(self, sample_ledger_data):
+        """Test a sibling row sharing the watermark timestamp is still applied."""
+        tracker = BankrollTracker()
+        for entry in sample_ledger_data:
+            tracker.apply_ledger_entry(entry)
+
+        sibling = {'id': 'ledger-2b', 'amount': -25.00, 'created_at': '2024-01-15T18:00:00Z'}
+        tracker.apply_ledger_entry(sibling)
+        tracker.apply_ledger_entry(sibling)
+
+        assert tracker.balance == 925.00
+
+    def test_load_same_timestamp_siblings_out_of_order(self):
+        """Test siblings from one transaction settle on the chain's final balance in any order."""
+        first = {'id': 'ledger-a', 'amount': -50.00, 'balance_after': 950.00, 'created_at': '2024-01-15T18:00:00Z'}
+        second = {'id': 'ledger-b', 'amount': -25.00, 'balance_after': 925.00, 'created_at': '2024-01-15T18:00:00Z'}
+
+        supabase = Mock()
+        ledger_response = Mock()
+        ledger_response.data = [second]
+        supabase.table.return_value.select.return_value.order.return_value.limit.return_value.execute.return_value = ledger_response
+        sync_response = Mock()
+        sync_response.data = [first, second]
+        supabase.table.return_value.select.return_value.gte.return_value.order.return_value.order.return_value\
+            .range.return_value.execute.return_value = sync_response
+        supabase.table.return_value.select.return_value.in_.return_value.execute.return_value.data = []
+
+        tracker = create_bankroll_tracker(supabase)
+        assert tracker.balance == 925.00
+
+        reverse = BankrollTracker()
+        reverse.apply_ledger_entry(second)
+        reverse.apply_ledger_entry(first)
+        assert reverse.balance == 925.00
+
+    def test_sync_paginates(self, sample_ledger_data):
+        """Test a backlog larger than one page is applied in full."""
+        supabase = Mock()
+        first_page = Mock()
+        first_page.data = sample_ledger_data[:1]
+        second_page = Mock()
+        second_page.data = sample_ledger_data[1:]
+        last_page = Mock()
+        last_page.data = []
+        page_query = supabase.table.return_value.select.return_value.order.return_value.order.return_value
+        page_query.range.return_value.execute.side_effect = [first_page, second_page, last_page]
+
+        tracker = BankrollTracker()
+        entries = tracker.sync(supabase, page_size=1)
+
+        assert len(entries) == 2
+        assert page_query.range.call_args_list[1][0] == (1, 1)
+        assert tracker.balance == 950.00
+
+    def test_reload_keeps_bets_updated_during_select(self, tracker, sample_bets_data):
+        """Test a realtime settle applied mid-reload is not undone by the stale row."""
+        supabase = Mock()
+
+        def stale_select():
+            tracker.apply_bet({**sample_bets_data[0], 'status': 'won'})
+            response = Mock()
+            response.data = sample_bets_data
+            return response
+
+        supabase.table.return_value.select.return_value.in_.return_value.execute.side_effect = stale_select
+
+        tracker.reload_open_bets(supabase)
+
+        assert tracker.open_exposure == 65.00
+        assert tracker.market_exposure('game-123', 'h2h') == 0.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -5,6 +5,7 @@ Tests feature builder with static fixture sets to ensure
 reliable and reproducible feature generation.
 """
 
+import json
 import pytest
 import pandas as pd
 import numpy as np
@@ -14,6 +15,20 @@ from datetime import datetime
 from features import FeatureBuilder, create_feature_builder
 
 
+def mock_paged_odds(supabase, rows):
+    """Serve odds_snapshots pages from rows already in ts desc, market, bookmaker order."""
+    page_query = supabase.table.return_value.select.return_value.eq.return_value\
+        .order.return_value.order.return_value.order.return_value
+
+    def page(start, end):
+        response = Mock()
+        response.data = rows[start:end + 1]
+        return Mock(execute=Mock(return_value=response))
+
+    page_query.range.side_effect = page
+    return page_query
+
+
 class TestFeatureBuilder:
     """Test suite for FeatureBuilder class using static fixtures."""
     
@@ -152,6 +167,22 @@ class TestFeatureBuilder:
         assert games_df.iloc[0]['home'] == 'Los Angeles Lakers'
         assert isinstance(games_df.iloc[0]['tipoff'], pd.Timestamp)
     
+    def test_fetch_upcoming_games(self, feature_builder, sample_games_data):
+        """Test fetching games in a tipoff window, ordered by tipoff."""
+        mock_response = Mock()
+        mock_response.data = sample_games_data
+        query = feature_builder.supabase.table.return_value.select.return_value
+        query.gte.return_value.lt.return_value.order.return_value.limit.return_value.execute.return_value = mock_response
+
+        start = datetime(2024, 1, 15, 12, 0)
+        games_df = feature_builder.fetch_upcoming_games(start=start, hours=48)
+
+        query.gte.assert_called_once_with('tipoff', '2024-01-15T12:00:00')
+        query.gte.return_value.lt.assert_called_once_with('tipoff', '2024-01-17T12:00:00')
+        query.gte.return_value.lt.return_value.order.assert_called_once_with('tipoff')
+        assert len(games_df) == 2
+        assert isinstance(games_df.iloc[0]['tipoff'], pd.Timestamp)
+
     def test_fetch_odds_snapshots(self, feature_builder, sample_odds_data):
         """Test fetching odds snapshots for a game."""
         # Mock Supabase response
@@ -167,7 +198,73 @@ class TestFeatureBuilder:
         assert all(odds_df['game_id'] == 'game-123')
         assert isinstance(odds_df.iloc[0]['ts'], pd.Timestamp)
         assert odds_df.iloc[0]['home_odds'] == 1.95
-    
+
+    def test_fetch_odds_snapshots_dedupe(self, feature_builder, sample_odds_data):
+        """Test fetching odds snapshots collapsed into price-change segments."""
+        repeated_poll = {**sample_odds_data[2], 'ts': '2024-01-15T17:15:00Z'}
+        rows = sample_odds_data[:2] + [repeated_poll, sample_odds_data[2]]
+        page_query = mock_paged_odds(feature_builder.supabase, rows)
+
+        odds_df = feature_builder.fetch_odds_snapshots('game-123', limit=2, dedupe=True)
+
+        # The first read is sized to the window; the raw_data payload is never selected
+        assert page_query.range.call_args_list[0][0] == (0, 1)
+        select_columns = feature_builder.supabase.table.return_value.select.call_args[0][0]
+        assert 'raw_data' not in select_columns and 'home_odds' in select_columns
+
+        # Repeated fanduel poll collapses; newest two segments returned
+        assert len(odds_df) == 2
+        assert list(odds_df['bookmaker']) == ['fanduel', 'draftkings']
+        assert odds_df.iloc[0]['home_odds'] == 1.95
+        assert 'num_snapshots' in odds_df.columns
+        assert not odds_df['truncated'].any()
+
+    @pytest.fixture
+    def busy_slate_rows(self):
+        """10 books x 3 markets polled 50 times with one real h2h move, newest first."""
+        rows = []
+        for poll in reversed(range(50)):
+            for market in ('h2h', 'spreads', 'totals'):
+                for book in range(10):
+                    moved = market == 'h2h' and book == 0 and poll >= 25
+                    rows.append({
+                        'game_id': 'game-123',
+                        'market': market,
+                        'ts': f"2024-01-15T17:{poll:02d}:00+00:00",
+                        'bookmaker': f"book-{book}",
+                        'home_odds': 2.05 if moved else 1.95,
+                        'away_odds': 1.80 if moved else 1.87
+                    })
+        return rows
+
+    def test_fetch_odds_segments_pages_past_unchanged_polls(self, feature_builder, busy_slate_rows):
+        """Test the segment window pages back far enough to hold the real line move."""
+        page_query = mock_paged_odds(feature_builder.supabase, busy_slate_rows)
+
+        odds_df = feature_builder.fetch_odds_snapshots('game-123', limit=10, dedupe=True)
+
+        assert len(odds_df) == 10
+        assert not odds_df['truncated'].any()
+        move = odds_df[odds_df['home_odds'] == 2.05]
+        assert len(move) == 1
+        assert move.iloc[0]['num_snapshots'] == 25
+
+        # Reads start at the window size and grow with the series seen
+        sizes = [end - start + 1 for start, end in (c[0] for c in page_query.range.call_args_list)]
+        assert sizes[0] == 10
+        assert sizes[1] == 100
+        assert sizes == sorted(sizes)
+
+    def test_fetch_odds_segments_flags_truncated(self, feature_builder, busy_slate_rows):
+        """Test segments cut off by the scan budget are flagged as truncated."""
+        mock_paged_odds(feature_builder.supabase, busy_slate_rows)
+
+        odds_df = feature_builder.fetch_odds_snapshots('game-123', limit=10, dedupe=True,
+                                                       scan_limit=300, page_size=100)
+
+        assert len(odds_df) == 10
+        assert odds_df['truncated'].all()
+
     def test_fetch_team_stats_success(self, feature_builder):
         """Test successful team stats fetch from Ball Don't Lie API."""
         mock_teams_response = {
@@ -286,7 +383,7 @@ class TestFeatureBuilder:
         # Mock odds fetch
         odds_response = Mock()
         odds_response.data = sample_odds_data
-        feature_builder.supabase.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value.execute.return_value = odds_response
+        feature_builder.supabase.table.return_value.select.return_value.eq.return_value.order.return_value.order.return_value.order.return_value.range.return_value.execute.return_value = odds_response
         
         # Mock team stats
         def mock_fetch_team_stats(team_name):
@@ -310,6 +407,17 @@ class TestFeatureBuilder:
         assert 'away_avg_points' in features
         assert 'points_differential' in features
     
+    def test_assemble_features_normalizes_tipoff(self, feature_builder, sample_games_data):
+        """Test raw and DataFrame-parsed game rows give identical, JSON-safe features."""
+        raw_game = sample_games_data[0]
+        parsed_game = {**raw_game, 'tipoff': pd.Timestamp(raw_game['tipoff'])}
+
+        raw = feature_builder.assemble_features(raw_game, pd.DataFrame(), {}, {})
+        parsed = feature_builder.assemble_features(parsed_game, pd.DataFrame(), {}, {})
+
+        assert raw['tipoff'] == parsed['tipoff'] == '2024-01-15T19:00:00+00:00'
+        assert json.dumps(raw, default=float) == json.dumps(parsed, default=float)
+    
     def test_build_features_for_game_not_found(self, feature_builder):
         """Test feature building when game is not found."""
         # Mock empty game response
@@ -0,0 +1,131 @@
+"""
+Unit tests for NBA Odds Snapshot Deduplication Module
+
+Tests run-length collapsing and compaction of odds snapshots
+with static fixture sets.
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+
+from odds_dedup import collapse_odds_snapshots, compact_odds_snapshots, find_redundant_snapshots
+
+
+class TestOddsDedup:
+    """Test suite for odds snapshot deduplication using static fixtures."""
+
+    @pytest.fixture
+    def sample_odds_data(self):
+        """Static fixture with repeated polls of unchanged prices."""
+        def snapshot(ts, bookmaker, home_odds, away_odds):
+            return {
+                'game_id': 'game-123',
+                'market': 'h2h',
+                'ts': ts,
+                'bookmaker': bookmaker,
+                'home_odds': home_odds,
+                'away_odds': away_odds,
+                'home_point': None,
+                'away_point': None,
+                'over_under': None
+            }
+
+        return [
+            snapshot('2024-01-15T17:04:00Z', 'fanduel', 1.95, 1.87),
+            snapshot('2024-01-15T17:03:00Z', 'fanduel', 1.92, 1.90),
+            snapshot('2024-01-15T17:02:00Z', 'fanduel', 1.92, 1.90),
+            snapshot('2024-01-15T17:01:00Z', 'fanduel', 1.92, 1.90),
+            snapshot('2024-01-15T17:00:00Z', 'fanduel', 1.92, 1.90),
+            snapshot('2024-01-15T17:02:00Z', 'draftkings', 1.90, 1.90),
+            snapshot('2024-01-15T17:00:00Z', 'draftkings', 1.90, 1.90)
+        ]
+
+    def test_collapse_unchanged_runs(self, sample_odds_data):
+        """Test consecutive identical prices become one segment per series."""
+        segments = collapse_odds_snapshots(pd.DataFrame(sample_odds_data))
+
+        assert len(segments) == 3
+
+        fanduel = segments[segments['bookmaker'] == 'fanduel'].reset_index(drop=True)
+        assert list(fanduel['home_odds']) == [1.92, 1.95]
+        assert list(fanduel['num_snapshots']) == [4, 1]
+        assert fanduel.iloc[0]['first_ts'] == pd.Timestamp('2024-01-15T17:00:00Z')
+        assert fanduel.iloc[0]['last_ts'] == pd.Timestamp('2024-01-15T17:03:00Z')
+        assert fanduel.iloc[0]['ts'] == fanduel.iloc[0]['first_ts']
+
+    def test_collapse_keeps_price_reversions(self):
+        """Test a price that moves away and back forms separate segments."""
+        odds_df = pd.DataFrame([
+            {'game_id': 'g', 'market': 'h2h', 'bookmaker': 'b', 'ts': '2024-01-15T17:00:00Z', 'home_odds': 1.9, 'away_odds': 1.9},
+            {'game_id': 'g', 'market': 'h2h', 'bookmaker': 'b', 'ts': '2024-01-15T17:01:00Z', 'home_odds': 2.0, 'away_odds': 1.8},
+            {'game_id': 'g', 'market': 'h2h', 'bookmaker': 'b', 'ts': '2024-01-15T17:02:00Z', 'home_odds': 1.9, 'away_odds': 1.9}
+        ])
+
+        assert len(collapse_odds_snapshots(odds_df)) == 3
+
+    def test_collapse_partial_history_flags_truncated(self, sample_odds_data):
+        """Test the oldest segment per series is flagged when history is partial."""
+        segments = collapse_odds_snapshots(pd.DataFrame(sample_odds_data), complete_history=False)
+
+        flagged = segments[segments['truncated']]
+        assert sorted(flagged['bookmaker']) == ['draftkings', 'fanduel']
+        assert list(segments[~segments['truncated']]['home_odds']) == [1.95]
+
+    def test_collapse_empty(self):
+        """Test collapsing an empty frame returns an empty frame."""
+        assert collapse_odds_snapshots(pd.DataFrame()).empty
+
+    def test_find_redundant_keeps_segment_ends(self, sample_odds_data):
+        """Test only interior snapshots of a segment are marked redundant."""
+        redundant = find_redundant_snapshots(pd.DataFrame(sample_odds_data))
+
+        assert list(redundant['bookmaker']) == ['fanduel', 'fanduel']
+        assert list(redundant['raw_ts']) == ['2024-01-15T17:01:00Z', '2024-01-15T17:02:00Z']
+
+    def test_compact_odds_snapshots(self, sample_odds_data):
+        """Test compaction deletes each segment's interior rows by series and ts range."""
+        supabase = Mock()
+        first_page = Mock()
+        first_page.data = sample_odds_data[:4]
+        second_page = Mock()
+        second_page.data = sample_odds_data[4:]
+        page_query = supabase.table.return_value.select.return_value.eq.return_value\
+            .order.return_value.order.return_value.order.return_value
+        page_query.range.return_value.execute.side_effect = [first_page, second_page]
+
+        deleted = compact_odds_snapshots(supabase, 'game-123', page_size=4)
+
+        # Rows past the first page are included in the compaction
+        assert page_query.range.call_args_list[1][0] == (4, 7)
+        assert deleted == 2
+        series_chain = supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value
+        series_chain.eq.assert_called_once_with('bookmaker', 'fanduel')
+        delete_chain = series_chain.eq.return_value
+        delete_chain.gt.assert_called_once_with('ts', '2024-01-15T17:00:00Z')
+        delete_chain.gt.return_value.lt.assert_called_once_with('ts', '2024-01-15T17:03:00Z')
+
+    def test_compact_long_unchanged_run(self):
+        """Test a long steady run is deleted with one short range filter, not a ts list."""
+        rows = [
+            {'game_id': 'game-123', 'market': 'h2h', 'bookmaker': 'fanduel',
+             'ts': (pd.Timestamp('2024-01-15T07:00:00Z') + pd.Timedelta(minutes=i)).isoformat(),
+             'home_odds': 1.92, 'away_odds': 1.90}
+            for i in range(720)
+        ]
+        supabase = Mock()
+        page = Mock()
+        page.data = rows
+        supabase.table.return_value.select.return_value.eq.return_value.order.return_value\
+            .order.return_value.order.return_value.range.return_value.execute.return_value = page
+
+        deleted = compact_odds_snapshots(supabase, 'game-123')
+
+        assert deleted == 718
+        delete_chain = supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value.eq.return_value
+        delete_chain.in_.assert_not_called()
+        delete_chain.gt.assert_called_once_with('ts', rows[0]['ts'])
+        delete_chain.gt.return_value.lt.assert_called_once_with('ts', rows[-1]['ts'])
+
+if __name__ == '__main__':
+    pytest.main([__file__])
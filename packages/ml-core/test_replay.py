@@ -0,0 +1,173 @@
+"""
+Unit tests for NBA Odds Replay Module
+
+Tests the in-memory query interface, synthetic stream generation and
+deterministic replay of static odds recordings.
+"""
+
+import pytest
+import pandas as pd
+
+from replay import (
+    ReplayClient,
+    ReplaySimulator,
+    create_replay_simulator,
+    feature_fingerprint,
+    fetch_recording,
+    generate_synthetic_odds,
+)
+
+
+class FakeClock:
+    """Manual clock so replay pacing is tested without real sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestReplay:
+    """Test suite for replay simulation using static fixtures."""
+
+    @pytest.fixture
+    def sample_games_data(self):
+        """Static fixture for games table data."""
+        return [
+            {
+                'id': 'game-123',
+                'home': 'Los Angeles Lakers',
+                'away': 'Boston Celtics',
+                'tipoff': '2024-01-15T19:00:00Z'
+            }
+        ]
+
+    @pytest.fixture
+    def sample_team_stats(self):
+        """Static fixture for recorded team statistics."""
+        return {
+            'Los Angeles Lakers': {'team_id': 14, 'avg_points': 118.5, 'avg_rebounds': 44.2, 'avg_assists': 26.8},
+            'Boston Celtics': {'team_id': 2, 'avg_points': 121.2, 'avg_rebounds': 46.1, 'avg_assists': 27.5}
+        }
+
+    @pytest.fixture
+    def sample_recording(self):
+        """Static fixture for a recorded odds stream."""
+        return generate_synthetic_odds(
+            ['game-123'], ['fanduel', 'draftkings'], '2024-01-15T17:00:00Z',
+            num_polls=5, interval_seconds=60, move_probability=0.5, seed=7
+        )
+
+    def test_replay_client_query(self):
+        """Test the in-memory client supports the FeatureBuilder query chain."""
+        client = ReplayClient({'odds_snapshots': [
+            {'game_id': 'g1', 'ts': '2024-01-15T17:00:00Z', 'home_odds': 1.9},
+            {'game_id': 'g1', 'ts': '2024-01-15T17:01:00Z', 'home_odds': 2.0},
+            {'game_id': 'g2', 'ts': '2024-01-15T17:02:00Z', 'home_odds': 2.1}
+        ]})
+
+        response = client.table('odds_snapshots').select('*').eq('game_id', 'g1')\
+            .order('ts', desc=True).limit(1).execute()
+
+        assert response.data == [{'game_id': 'g1', 'ts': '2024-01-15T17:01:00Z', 'home_odds': 2.0}]
+        assert len(client.table('odds_snapshots').select('*').in_('game_id', ['g2']).execute().data) == 1
+        assert len(client.table('odds_snapshots').select('*').range(1, 2).execute().data) == 2
+
+    def test_replay_client_chained_order(self):
+        """Test chained order() calls sort by every key, as the paged odds reads require."""
+        client = ReplayClient({'odds_snapshots': [
+            {'ts': '2024-01-15T17:00:00Z', 'market': 'h2h', 'bookmaker': 'fanduel'},
+            {'ts': '2024-01-15T17:01:00Z', 'market': 'totals', 'bookmaker': 'draftkings'},
+            {'ts': '2024-01-15T17:01:00Z', 'market': 'h2h', 'bookmaker': 'fanduel'},
+            {'ts': '2024-01-15T17:01:00Z', 'market': 'h2h', 'bookmaker': 'draftkings'}
+        ]})
+
+        rows = client.table('odds_snapshots').select('*').order('ts', desc=True)\
+            .order('market').order('bookmaker').execute().data
+
+        assert [(row['ts'][11:16], row['market'], row['bookmaker']) for row in rows] == [
+            ('17:01', 'h2h', 'draftkings'),
+            ('17:01', 'h2h', 'fanduel'),
+            ('17:01', 'totals', 'draftkings'),
+            ('17:00', 'h2h', 'fanduel')
+        ]
+
+    def test_generate_synthetic_odds_reproducible(self):
+        """Test synthetic streams are identical for the same seed."""
+        first = generate_synthetic_odds(['g1'], ['fanduel'], '2024-01-15T17:00:00Z', num_polls=20, seed=1)
+        second = generate_synthetic_odds(['g1'], ['fanduel'], '2024-01-15T17:00:00Z', num_polls=20, seed=1)
+
+        assert len(first) == 20
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_invalid_speed(self, sample_recording, sample_games_data):
+        """Test replay speed must be within 1x-1000x."""
+        with pytest.raises(ValueError, match="speed must be between"):
+            ReplaySimulator(sample_recording, sample_games_data, speed=5000)
+
+    def test_replay_paces_events(self, sample_recording, sample_games_data, sample_team_stats):
+        """Test events are re-emitted at the recorded spacing divided by speed."""
+        clock = FakeClock()
+        simulator = ReplaySimulator(sample_recording, sample_games_data, sample_team_stats,
+                                    speed=60, clock=clock, sleep=clock.sleep)
+
+        report = simulator.run(track_memory=False)
+
+        # 5 polls one minute apart at 60x -> one second between events
+        assert report['events'] == 5
+        assert report['snapshots'] == 10
+        assert clock.sleeps == [1.0, 1.0, 1.0, 1.0]
+        assert report['elapsed_s'] == 4.0
+        assert report['latency_ms']['max'] == 0.0
+
+    def test_replay_builds_features_from_visible_snapshots(self, sample_recording, sample_games_data, sample_team_stats):
+        """Test each event only sees snapshots emitted so far."""
+        report = create_replay_simulator(sample_recording, sample_games_data, sample_team_stats, speed=1000).run()
+
+        first, last = report['features'][0], report['features'][-1]
+        assert first['game_id'] == 'game-123'
+        assert first['num_bookmakers'] == 2
+        assert first['points_differential'] == 118.5 - 121.2
+        assert last['event_ts'] > first['event_ts']
+        assert report['throughput_eps'] > 0
+
+    def test_memory_measured_in_separate_pass(self, sample_recording, sample_games_data, sample_team_stats):
+        """Test memory is only traced when requested, outside the timed pass."""
+        clock = FakeClock()
+        simulator = ReplaySimulator(sample_recording, sample_games_data, sample_team_stats,
+                                    speed=60, clock=clock, sleep=clock.sleep)
+
+        assert simulator.run()['peak_memory_mb'] is None
+
+        report = simulator.run(track_memory=True)
+
+        assert report['peak_memory_mb'] > 0
+        # The untimed memory pass never sleeps
+        assert clock.sleeps == [1.0] * 8
+
+    def test_fetch_recording_paginates(self, sample_recording):
+        """Test recordings larger than one page are read in full."""
+        client = ReplayClient({'odds_snapshots': sample_recording.to_dict(orient='records')})
+
+        recording = fetch_recording(client, ['game-123'], page_size=3)
+
+        assert len(recording) == len(sample_recording)
+        assert recording['ts'].is_monotonic_increasing
+
+    def test_replay_is_deterministic(self, sample_recording, sample_games_data, sample_team_stats):
+        """Test the same recording reproduces identical feature outputs."""
+        first = create_replay_simulator(sample_recording, sample_games_data, sample_team_stats, speed=1000).run()
+        second = create_replay_simulator(sample_recording, sample_games_data, sample_team_stats, speed=1000).run()
+
+        assert first['fingerprint'] == second['fingerprint']
+        assert first['fingerprint'] == feature_fingerprint(first['features'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,153 @@
+"""
+Unit tests for NBA Slate Schedule Module
+
+Tests the tipoff-ordered index, refresh prioritization and
+look-ahead prefetching with static fixtures and a fixed clock.
+"""
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from slate import SlateScheduler, create_slate_scheduler
+
+
+NOW = datetime(2024, 1, 15, 18, 0, tzinfo=timezone.utc)
+
+
+class TestSlateScheduler:
+    """Test suite for SlateScheduler class using static fixtures."""
+
+    @pytest.fixture
+    def sample_games_data(self):
+        """Static fixture for an evening slate, deliberately unordered."""
+        return [
+            {'id': 'game-late', 'home': 'Golden State Warriors', 'away': 'Miami Heat', 'tipoff': '2024-01-16T03:00:00Z'},
+            {'id': 'game-soon', 'home': 'Los Angeles Lakers', 'away': 'Boston Celtics', 'tipoff': '2024-01-15T18:10:00Z'},
+            {'id': 'game-mid', 'home': 'Boston Celtics', 'away': 'Miami Heat', 'tipoff': '2024-01-15T19:30:00Z'}
+        ]
+
+    @pytest.fixture
+    def builder(self, sample_games_data):
+        """Mock FeatureBuilder returning the sample slate."""
+        builder = Mock()
+
+        games_df = pd.DataFrame(sample_games_data)
+        games_df['tipoff'] = pd.to_datetime(games_df['tipoff'])
+        builder.fetch_upcoming_games.return_value = games_df
+        builder.fetch_odds_snapshots.return_value = pd.DataFrame()
+        builder.fetch_team_stats.side_effect = lambda team: {'team_name': team, 'avg_points': 110.0}
+        builder.assemble_features.side_effect = lambda game, odds_df, home, away: {
+            'game_id': game['id'],
+            'home_team': home['team_name'],
+            'away_team': away['team_name']
+        }
+        return builder
+
+    @pytest.fixture
+    def scheduler(self, builder):
+        """Scheduler with a loaded index and a fixed clock."""
+        scheduler = SlateScheduler(builder, horizon_minutes=180, clock=lambda: NOW)
+        scheduler.load()
+        return scheduler
+
+    def test_index_is_tipoff_ordered(self, scheduler, builder):
+        """Test games are indexed in tipoff order from the upcoming query."""
+        assert scheduler.games == ['game-soon', 'game-mid', 'game-late']
+        builder.fetch_upcoming_games.assert_called_once_with(start=NOW, hours=24)
+
+    def test_upcoming_within_horizon(self, scheduler):
+        """Test only games inside the prefetch horizon are upcoming."""
+        assert scheduler.upcoming() == ['game-soon', 'game-mid']
+        assert scheduler.upcoming(within=timedelta(minutes=30)) == ['game-soon']
+
+    def test_refresh_interval_tiers(self, scheduler):
+        """Test imminent games refresh more often than later ones."""
+        assert scheduler.refresh_interval('game-soon') == 30
+        assert scheduler.refresh_interval('game-mid') == 300
+        assert scheduler.refresh_interval('game-late') == 900
+
+    def test_tick_warms_due_games(self, scheduler, builder):
+        """Test a tick prefetches in-horizon games and shares team stats."""
+        warmed = scheduler.tick()
+
+        assert warmed == ['game-soon', 'game-mid']
+        assert builder.fetch_odds_snapshots.call_count == 2
+        # Celtics play in both games but are fetched once
+        assert builder.fetch_team_stats.call_count == 3
+        assert scheduler.due_games() == []
+
+    def test_refresh_prioritized_by_tipoff(self, scheduler):
+        """Test the imminent game becomes due before the later one."""
+        scheduler.tick()
+
+        later = NOW + timedelta(seconds=45)
+        assert scheduler.due_games(later) == ['game-soon']
+
+    def test_get_features_hot(self, scheduler, builder):
+        """Test a prediction request reads prefetched features without refetching."""
+        scheduler.tick()
+        builder.fetch_odds_snapshots.reset_mock()
+
+        features = scheduler.get_features('game-soon')
+
+        assert features['game_id'] == 'game-soon'
+        assert features['home_team'] == 'Los Angeles Lakers'
+        builder.fetch_odds_snapshots.assert_not_called()
+
+    def test_get_features_unknown_game(self, scheduler, builder):
+        """Test games outside the index fall back to a full build."""
+        builder.build_features_for_game.return_value = {'game_id': 'game-other'}
+
+        assert scheduler.get_features('game-other') == {'game_id': 'game-other'}
+        builder.build_features_for_game.assert_called_once_with('game-other')
+
+    def test_prune_started_games(self, scheduler):
+        """Test games that have tipped off leave the index and cache."""
+        scheduler.tick()
+
+        started = scheduler.prune(NOW + timedelta(minutes=20))
+
+        assert started == ['game-soon']
+        assert scheduler.games == ['game-mid', 'game-late']
+
+    def test_add_game_reschedules(self, scheduler):
+        """Test re-adding a game with a new tipoff moves it in the index."""
+        scheduler.add_game({'id': 'game-late', 'home': 'Golden State Warriors', 'away': 'Miami Heat',
+                            'tipoff': '2024-01-15T18:05:00Z'})
+
+        assert scheduler.games == ['game-late', 'game-soon', 'game-mid']
+
+    def test_load_forgets_rescheduled_games(self, scheduler, builder, sample_games_data):
+        """Test a reload invalidates prefetched features for a game whose row changed."""
+        scheduler.tick()
+
+        rescheduled = [dict(game) for game in sample_games_data]
+        rescheduled[2]['tipoff'] = '2024-01-15T20:00:00Z'
+        games_df = pd.DataFrame(rescheduled)
+        games_df['tipoff'] = pd.to_datetime(games_df['tipoff'])
+        builder.fetch_upcoming_games.return_value = games_df
+
+        scheduler.load()
+
+        assert scheduler.due_games() == ['game-mid']
+
+    def test_tick_handles_prefetch_errors(self, scheduler, builder):
+        """Test a failing prefetch is skipped with a warning."""
+        builder.fetch_odds_snapshots.side_effect = [RuntimeError("API Error"), pd.DataFrame()]
+
+        warmed = scheduler.tick()
+
+        assert warmed == ['game-mid']
+
+    def test_create_slate_scheduler_factory(self, builder):
+        """Test factory wraps a provided builder."""
+        scheduler = create_slate_scheduler(builder, horizon_minutes=60)
+
+        assert isinstance(scheduler, SlateScheduler)
+        assert scheduler.horizon == timedelta(minutes=60)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])